@@ -1,7 +1,15 @@
 # 🌍 GLOBAL TEMPERATURE STORY DASHBOARD 
 import streamlit as st
 import pandas as pd
-import altair as alt
+import numpy as np
+
+import chart_data
+import climate_charts
+import climate_bot
+import climate_data
+import climate_stats
+import snapshots
+import stage_timing
 
 # ─── Page Config ────────────────────────────────────
 st.set_page_config(
@@ -56,6 +64,9 @@ Use this menu to switch between sections of the dashboard:
 - **Home**: Overview of global temperature trends
 - **Explore Trends**: Yearly patterns, variability, and status comparisons
 - **Warming Gases**: Contributions by greenhouse gases and sources
+- **Monthly Explorer**: Seasonal cycles and monthly anomalies
+- **Contributions**: Which countries caused the most warming since 1851
+- **Food & Climate**: How temperature change tracks food production
 - **Placeholder**: This is a placeholder page.
 - **Chat Assistant**: Ask questions like "Which country warmed fastest in 1998?"
 
@@ -63,119 +74,225 @@ Use this menu to switch between sections of the dashboard:
 """)
 page = st.sidebar.radio(
     "Go to:",
-    ["Home", "Explore Trends", "Warming Gases", "Placeholder", "Chat Assistant"],  
+    ["Home", "Explore Trends", "Warming Gases", "Monthly Explorer", "Contributions", "Food & Climate", "Placeholder", "Chat Assistant"],  
     index=0
 )
 
-# ─── Data Load and Prep ─────────────────
-@st.cache_data
-def load_data():
-    df = pd.read_csv("Indicator_3_1_Climate_Indicators_Annual_Mean_Global_Surface_Temperature_577579683071085080.csv")
-    year_cols = [c for c in df.columns if c.isdigit()]
-    df_long = df.melt(
-        id_vars=["Country", "ISO2", "ISO3", "Indicator", "Unit"],
-        value_vars=year_cols,
-        var_name="Year",
-        value_name="TempChange"
-    )
-    df_long["Year"] = df_long["Year"].astype(int)
-    df_long.sort_values(["Country", "Year"], inplace=True)
-
-    # Add DevStatus 
-    developed_iso3 = ["USA", "CAN", "GBR", "DEU", "FRA", "JPN", "AUS", "NZL", "NOR", "SWE", "CHE"]
-    df_long["DevStatus"] = df_long["ISO3"].apply(lambda x: "Developed" if x in developed_iso3 else "Developing")
-
-    return df_long
+# ─── Stage Timings ─────────────────
+# Input loads, chart reductions and renders are timed for every rerun; the
+# sidebar panel showing them is opt-in via DASHBOARD_TIMINGS=1.
+timer = stage_timing.StageTimer()
 
-df_long = load_data()
+# ─── Data Load and Prep ─────────────────
+# Loaders return dataset handles; cached functions below take a handle plus
+# filter values, so Streamlit hashes a short tuple instead of a whole frame.
+# Source loaders take their files' (mtime, size) stamp, checked every rerun:
+# when a file changes, the next rerun loads the new release (only appended
+# years are parsed and derived where possible) and gets new handles, while
+# sessions midway through a rerun finish on the previous ones. Each cache
+# keeps the current and previous version only.
+@st.cache_resource(max_entries=climate_data.DATASET_VERSIONS_KEPT)
+def load_data(stamp):
+    # Parsed once into .data_cache/ and memory-mapped on later starts.
+    # Shared by every session, so pages must treat it as read-only. The matrix
+    # and everything derived from it live in shared mmap files, so extra
+    # sessions and server processes attach instead of copying.
+    # On a cold start every stale source is parsed at once in worker
+    # processes, so the first data page waits on the largest file only.
+    climate_data.ingest()
+    return climate_data.load_indicator_cube()
+
+@st.cache_resource(max_entries=climate_data.DATASET_VERSIONS_KEPT)
+def load_metrics(indicator):
+    # YoY deltas, warming trends and coverage for every country, computed once
+    return climate_stats.TrendMetrics(climate_data.resolve(indicator))
+
+@st.cache_resource(max_entries=climate_data.DATASET_VERSIONS_KEPT)
+def load_variability(indicator):
+    # Prefix sums over years: any split year or rolling window is O(1) per country
+    return climate_stats.VariabilityEngine(climate_data.resolve(indicator))
+
+@st.cache_resource(max_entries=climate_data.DATASET_VERSIONS_KEPT)
+def load_aggregates(indicator, food_stamp):
+    # Partial sums per (group, year); the Country Status tab derives yearly and
+    # N-year means from these without touching the raw rows. A new indicator
+    # release that only appends years merges just those years' sums in; the
+    # food stamp is part of the key since the store also covers that dataset.
+    return climate_stats.build_aggregates(indicator)
+
+# ─── Chart Payloads ───────
+# Every chart frame goes through chart_data first: projected to the encoded
+# fields and downsampled past CHART_POINT_BUDGET before Altair inlines it.
+chart_reports = []
+
+def chart_frame(df, fields, label, **reduce_args):
+    with timer.stage(f"reduce: {label}"):
+        data, report = chart_data.reduce_for_chart(df, fields, label=label, **reduce_args)
+    chart_reports.append(report)
+    return data
+
+def show_chart(chart, label):
+    # Spec serialization happens inside st.altair_chart, so it is timed here
+    with timer.stage(f"chart: {label}"):
+        st.altair_chart(chart, use_container_width=True)
+
+# ─── Snapshots ───────
+# Default views pre-rendered by `python snapshots.py`. A chart whose filters
+# match a recorded one is served from its stored spec, without building any
+# frame or Altair object; other filters are built live as before.
+@st.cache_resource(max_entries=climate_data.DATASET_VERSIONS_KEPT)
+def load_snapshots(stamp):
+    # The version hashes every source, so they are ingested before it is read
+    climate_data.ingest()
+    return snapshots.SnapshotStore(snapshots.snapshot_version())
+
+def snapshot_charts(labels, params, build):
+    # `params` must hold every filter the charts depend on; build() returns
+    # the charts in `labels` order and only runs on a snapshot miss.
+    recording = snapshots.recording_dir() is not None
+    specs = [] if recording else [inputs["snapshots"].get(label, params) for label in labels]
+    if specs and all(spec is not None for spec in specs):
+        for label, spec in zip(labels, specs):
+            with timer.stage(f"snapshot: {label}"):
+                st.vega_lite_chart(spec, use_container_width=True)
+        return
+    for label, chart in zip(labels, build()):
+        if recording:
+            snapshots.record(label, params, chart)
+        show_chart(chart, label)
+
+def snapshot_chart(label, params, build):
+    snapshot_charts([label], params, lambda: [build()])
+
+def country_iso3(cube, country):
+    # Other datasets name countries differently; ISO3 is the shared key
+    return None if country == "All" else cube.iso3.get(country)
 
 # ─── Warming Gases Page ───────
-@st.cache_data
-def prepare_gas_data(df2, dev_year_range, chart_country):
-    # Filter the DataFrame based on the selected year range
-    df2_filtered = df2[
-        (df2["Year"] >= dev_year_range[0]) &
-        (df2["Year"] <= dev_year_range[1])
-    ].copy()
-
-    # Function to get gas data for a specific entity
-    def gas_data(entity):
-        name = "World" if entity == "All" else entity
-        return df2_filtered[df2_filtered["Entity"] == name].drop(columns=["Code"]).copy()
-
-    # Define a mapping for gases and their sources
-    gas_mapping = {
-        "nitrous oxide": {
-            "fossil fuels": "N2O_FF&I",
-            "default": "N2O_AgLU"
-        },
-        "methane": {
-            "fossil fuels": "CH4_FF&I",
-            "default": "CH4_AgLU"
-        },
-        "fossil fuels": "CO2_FF&I",
-        "default": "CO2_AgLU"
-    }
-
-    # Shorten column names using the mapping
-    gas_cols = [c for c in df2_filtered.columns if c.startswith("Change in")]
-    shortened_columns = {}
-
-    for col in gas_cols:
-        for gas, sources in gas_mapping.items():
-            if gas in col:
-                if isinstance(sources, dict):
-                    for source, new_name in sources.items():
-                        if source in col:
-                            shortened_columns[col] = new_name
-                            break
-                else:
-                    shortened_columns[col] = sources
-                break
-        else:
-            shortened_columns[col] = "CO2_AgLU"  # Default case
-
-    # Get the gas data and rename columns
-    gas_df = gas_data(chart_country).rename(columns=shortened_columns)
-
-    # Melt the DataFrame for visualization
-    gas_long = gas_df.melt(
-        id_vars="Year",
-        value_vars=list(shortened_columns.values()),
-        var_name="series",
-        value_name="Temp Change"
+@st.cache_resource(max_entries=climate_data.DATASET_VERSIONS_KEPT)
+def load_gas_data(stamp):
+    # Series columns and per-Entity row blocks are resolved once per process
+    return climate_data.register_dataset("gas", climate_data.load_gas(), climate_data.source_version("gas"))
+
+def gas_entity(gas, chart_country, cube):
+    # Match dashboard countries to gas entities by ISO3 code, since names differ
+    iso3 = country_iso3(cube, chart_country)
+    entity = gas.entity_for(chart_country, iso3)
+    if entity is None:
+        st.warning(f"No gas contribution data for {chart_country}; showing World instead.")
+        entity = "World"
+    return entity
+
+def prepare_gas_data(gas_handle, dev_year_range, entity):
+    # Not wrapped in st.cache_data: GasSeries.long is already a bounded LRU
+    # keyed on (entity, year range) for this dataset version.
+    return climate_data.resolve(gas_handle).long(entity, tuple(dev_year_range))
+
+# ─── Monthly Explorer Page ───────
+@st.cache_resource(max_entries=climate_data.DATASET_VERSIONS_KEPT)
+def load_monthly_data(stamp):
+    # (entity, month, year) float32 array, memory-mapped and shared by all sessions
+    return climate_data.load_monthly()
+
+# ─── Contributions Page ───────
+@st.cache_resource(max_entries=climate_data.DATASET_VERSIONS_KEPT)
+def load_contributions_data(stamp):
+    # Per-year rank orders and per-entity share series, built once into .data_cache/
+    return climate_data.load_contributions()
+
+# ─── Food & Climate Page ───────
+FOOD_METRIC_LABELS = {
+    "Growth Rate": "Food production growth rate",
+    climate_data.FOOD_VALUE_COL: "Food gross production value",
+}
+
+@st.cache_resource(max_entries=climate_data.DATASET_VERSIONS_KEPT)
+def load_food_data(stamp):
+    # TempChange and food metrics pre-aligned on (ISO3, Year) in one array
+    panel = climate_data.load_food_panel()
+    return climate_data.register_dataset("food_panel", panel, panel.shared_as.version)
+
+@st.cache_resource(max_entries=climate_data.DATASET_VERSIONS_KEPT)
+def load_food_correlations(food):
+    # Every country, metric and lag correlated once; the page only indexes results
+    return climate_stats.FoodCorrelations(climate_data.resolve(food))
+
+# ─── Chat Assistant Page ───────
+CHAT_HISTORY_LIMIT = 50
+
+@st.cache_resource(max_entries=climate_data.DATASET_VERSIONS_KEPT)
+def load_bot(indicator):
+    # Per-year rank orders are built here once; each question is a few lookups
+    return climate_bot.ClimateBot(
+        climate_data.resolve(indicator),
+        load_metrics(indicator),
+        climate_data.resolve(load_aggregates(indicator, climate_data.source_stamp("food"))),
+        load_variability(indicator),
     )
 
-    # Add a legend mapping for better readability
-    label_map = {
-        "CO2_FF&I": "CO₂ (Fossil Fuels & Industry)",
-        "CO2_AgLU": "CO₂ (Agriculture & Land Use)",
-        "CH4_FF&I": "CH₄ (Fossil Fuels & Industry)",
-        "CH4_AgLU": "CH₄ (Agriculture & Land Use)",
-        "N2O_FF&I": "N₂O (Fossil Fuels & Industry)",
-        "N2O_AgLU": "N₂O (Agriculture & Land Use)"
-    }
-    gas_long["Legend"] = gas_long["series"].map(label_map)
-
-    return gas_long 
-    
+# ─── View Registry ───────────────
+# Pages and Explore Trends tabs are registered as views that declare the
+# inputs they read. Inputs are resolved on first use within a rerun and
+# memoized, and only the active view runs, so Home, chat messages and hidden
+# tabs never load data or build charts they don't show.
+INPUTS = {}
+VIEWS = {}
+
+def dashboard_input(name):
+    def register(loader):
+        INPUTS[name] = loader
+        return loader
+    return register
+
+def view(name, needs=()):
+    def register(render):
+        VIEWS[name] = (needs, render)
+        return render
+    return register
+
+class Inputs(dict):
+    # Inputs resolved so far this rerun; a loader may ask for other inputs
+    def __missing__(self, name):
+        with timer.stage(f"input: {name}"):
+            self[name] = INPUTS[name](self)
+        return self[name]
+
+inputs = Inputs()
+
+def render_view(name):
+    needs, render = VIEWS[name]
+    with timer.stage(f"view: {name}"):
+        render(*(inputs[n] for n in needs))
+
+dashboard_input("indicator")(lambda inputs: load_data(climate_data.source_stamp("indicator", "country_groups")))
+dashboard_input("cube")(lambda inputs: climate_data.resolve(inputs["indicator"]))
+dashboard_input("metrics")(lambda inputs: load_metrics(inputs["indicator"]))
+dashboard_input("variability")(lambda inputs: load_variability(inputs["indicator"]))
+dashboard_input("aggregates")(lambda inputs: climate_data.resolve(
+    load_aggregates(inputs["indicator"], climate_data.source_stamp("food"))))
+dashboard_input("gas")(lambda inputs: load_gas_data(climate_data.source_stamp("gas")))
+dashboard_input("monthly")(lambda inputs: load_monthly_data(climate_data.source_stamp("monthly_cube")))
+dashboard_input("contributions")(lambda inputs: load_contributions_data(climate_data.source_stamp("contributions_cube")))
+dashboard_input("food_handle")(
+    lambda inputs: load_food_data(climate_data.source_stamp("food_panel", "country_groups")))
+dashboard_input("food")(lambda inputs: climate_data.resolve(inputs["food_handle"]))
+dashboard_input("food_correlations")(lambda inputs: load_food_correlations(inputs["food_handle"]))
+dashboard_input("snapshots")(lambda inputs: load_snapshots(climate_data.source_stamp()))
+dashboard_input("bot")(lambda inputs: load_bot(inputs["indicator"]))
+
 # ─── Sidebar Filters ───────────────
-if page not in ["Home", "Chat Assistant"]:
+@dashboard_input("country")
+def sidebar_filters(inputs):
+    cube = inputs["cube"]
     st.sidebar.header("🔍 Filters")
-    countries = ["All"] + sorted(df_long["Country"].unique())
-    years = sorted(df_long["Year"].unique())  # Keep years available if needed
+    countries = ["All"] + list(cube.countries)
 
     selected_country = st.sidebar.selectbox("Country", countries)
-    selected_year = st.sidebar.selectbox("Year", years)  # Optional: keep if you want to filter by year
-
-    # Filter the DataFrame based on selected country and year
-    filtered = df_long.copy()
-    
-    if selected_country != "All":
-        filtered = filtered[filtered["Country"] == selected_country]
+    return selected_country
 
 # ─── Home Page ───────────────────────────── 
-if page == "Home":
+@view("Home")
+def home_page():
     st.write("""
     ### About This Dashboard
     Over the past century, the Earth's surface temperature has experienced significant changes due to various natural and anthropogenic factors. This dashboard explores key global temperature trends, anomalies, and projections to provide insights into the ongoing climate challenges.
@@ -187,208 +304,148 @@ if page == "Home":
     """)
     
 # ─── Explore Trends Page Tabs ─────────────────────────────
-if page == "Explore Trends":
-    tab1, tab2, tab3, tab4 = st.tabs(["📈 Year-over-Year", "🌡️ Scatter Plot", "🔻 Variability", "🌍 Country Status"])
-
-    # ─── Tab 1: Year-over-Year Changes ─────────────────────
-    with tab1:
-        st.subheader("📈 Historical Year-over-Year Temperature Changes")
-        
-        st.write("""
-        **Explore the interactive visualization below!** 
-
-        - **Hover** over the data points in both the line and scatter plots to see detailed information about the **Year**, **Temperature Change (°C)**, and **Country**.
-        - **Select** specific countries in the scatter plot to highlight their temperature trends. The line chart will update to show the year-over-year changes for the selected country.
-        - **Analyze** the relationship between year-over-year changes (line) and overall temperature trends (scatter points) to identify patterns and anomalies.
-        - Use **zoom and pan** features to focus on specific time periods for a more detailed examination.
-        - To return to viewing all countries, simply **deselect** any highlighted points in the scatter plot.
-
-        Enjoy exploring the temperature trends!
-        """)
-
-        # Sample Countries Helper
-        def get_sample_countries(df, n=10, min_years=20):
-            country_counts = (
-                df.dropna(subset=["TempChange"])
-                .groupby("Country")["Year"]
-                .count()
-                .reset_index(name="count")
-            )
-            top_countries = country_counts[country_counts["count"] >= min_years].sort_values("count", ascending=False).head(n)
-            return top_countries["Country"].tolist()
-
-        if selected_country == "All":
-            sample_countries = get_sample_countries(df_long)
-            yoy_data = df_long[df_long["Country"].isin(sample_countries)].copy()
-            yoy_data["YoY_Change"] = yoy_data.groupby("Country")["TempChange"].diff()
-            scatter_data = df_long[df_long["Country"].isin(sample_countries)]
-
-            line = alt.Chart(yoy_data).mark_line(point=True).encode(
-                x=alt.X("Year:O"),
-                y=alt.Y("YoY_Change:Q", title="Change from Previous Year (°C)"),
-                color="Country:N",
-                tooltip=["Year", "Country", "YoY_Change"]
-            ).properties(title="Year-over-Year Change – Sample Countries", height=350, width=800)
+EXPLORE_TABS = ["📈 Year-over-Year", "🌡️ Scatter Plot", "🔻 Variability", "🌍 Country Status"]
 
-        else:
-            yoy_data = df_long[df_long["Country"] == selected_country].copy()
-            yoy_data["YoY_Change"] = yoy_data["TempChange"].diff()
-            scatter_data = df_long[df_long["Country"] == selected_country]
+# ─── Tab 1: Year-over-Year Changes ─────────────────────
+@view("📈 Year-over-Year", needs=("country", "metrics"))
+def yoy_tab(selected_country, metrics):
+    st.subheader("📈 Historical Year-over-Year Temperature Changes")
+    
+    st.write("""
+    **Explore the interactive visualization below!** 
 
-            line = alt.Chart(yoy_data).mark_line(point=True).encode(
-                x=alt.X("Year:O"),
-                y=alt.Y("YoY_Change:Q", title="Change from Previous Year (°C)"),
-                color=alt.value("#f45b69"),
-                tooltip=["Year", "YoY_Change"]
-            ).properties(title=f"Year-over-Year Change – {selected_country}", height=350, width=800)
+    - **Hover** over the data points in both the line and scatter plots to see detailed information about the **Year**, **Temperature Change (°C)**, and **Country**.
+    - **Select** specific countries in the scatter plot to highlight their temperature trends. The line chart will update to show the year-over-year changes for the selected country.
+    - **Analyze** the relationship between year-over-year changes (line) and overall temperature trends (scatter points) to identify patterns and anomalies.
+    - Use **zoom and pan** features to focus on specific time periods for a more detailed examination.
+    - To return to viewing all countries, simply **deselect** any highlighted points in the scatter plot.
 
-        sel_country = alt.selection_point(fields=["Country"], empty="all")
+    Enjoy exploring the temperature trends!
+    """)
 
-        scatter = alt.Chart(scatter_data).mark_circle(size=60).encode(
-            x=alt.X("Year:O", title="Year"),
-            y=alt.Y("TempChange:Q", title="Temperature Change (°C)"),
-            color=alt.Color("TempChange:Q", scale=alt.Scale(scheme="plasma")),
-            opacity=alt.condition(sel_country, alt.value(1), alt.value(0.15)),
-            tooltip=["Country", "Year", "TempChange"]
-        ).add_params(sel_country).properties(title="Raw Temperature Change", height=350, width=800)
+    def build():
+        sample_countries = metrics.sample_countries()
+        yoy_data = metrics.yoy_frame(sample_countries if selected_country == "All" else selected_country)
+        scatter_data = chart_frame(yoy_data, ["Country", "Year", "TempChange"], "Raw temperature change",
+                                   x="Year", y="TempChange", series="Country")
+        yoy_data = chart_frame(yoy_data, ["Year", "Country", "YoY_Change"], "Year-over-year change",
+                               x="Year", y="YoY_Change", series="Country")
+        return climate_charts.yoy_chart(yoy_data, scatter_data, selected_country)
 
-        st.altair_chart(line & scatter, use_container_width=True)
+    snapshot_chart("Year-over-year", {"country": selected_country}, build)
 
-    # ─── Tab 2: Temperature Scatter Plot ───────────────────
-    with tab2:
-        st.subheader("🌡️ Temperature Change Scatter Plot by Country")
+    st.markdown("#### 🔥 Fastest-Warming Countries")
+    st.caption("Linear trend of annual temperature change, fitted over all available years (countries with 30+ years of data).")
+    fastest = metrics.fastest_warming(10).rename(columns={"Trend": "Trend (°C/decade)", "Coverage": "Years of Data"})
+    st.dataframe(fastest[["Country", "Trend (°C/decade)", "Years of Data"]], hide_index=True)
 
-        st.write("""
-        This scatter plot shows the **actual annual temperature change** for each country over time.
-        Use the interactive legend and selection tool to highlight a country and explore its data.
-        """)
+# ─── Tab 2: Temperature Scatter Plot ───────────────────
+@view("🌡️ Scatter Plot", needs=("country", "cube"))
+def scatter_tab(selected_country, cube):
+    st.subheader("🌡️ Temperature Change Scatter Plot by Country")
 
-        sel_country_2 = alt.selection_point(fields=["Country"], empty="all")
+    st.write("""
+    This scatter plot shows the **actual annual temperature change** for each country over time.
+    Use the interactive legend and selection tool to highlight a country and explore its data.
+    """)
 
+    def build():
         if selected_country == "All":
-            scatter_data_2 = df_long[df_long["Country"].isin(df_long["Country"].unique()[:10])]
+            scatter_data_2 = cube.frame(cube.countries[~cube.aggregate][:10])
         else:
-            scatter_data_2 = df_long[df_long["Country"] == selected_country]
-
-        scatter_chart = alt.Chart(scatter_data_2).mark_circle(size=60).encode(
-            x=alt.X("Year:O", title="Year"),
-            y=alt.Y("TempChange:Q", title="Temperature Change (°C)"),
-            color=alt.Color("Country:N" if selected_country == "All" else "TempChange:Q", 
-                            scale=alt.Scale(scheme="plasma")),
-            opacity=alt.condition(sel_country_2, alt.value(1), alt.value(0.15)),
-            tooltip=["Country", "Year", "TempChange"]
-        ).add_params(sel_country_2).properties(
-            width=800,
-            height=450,
-            title="Annual Temperature Change by Country"
-        )
+            scatter_data_2 = cube.frame(selected_country)
+
+        scatter_data_2 = chart_frame(scatter_data_2, ["Country", "Year", "TempChange"], "Scatter plot",
+                                     x="Year", y="TempChange", series="Country")
+        return climate_charts.scatter_chart(scatter_data_2, selected_country)
 
-        st.altair_chart(scatter_chart, use_container_width=True)
+    snapshot_chart("Scatter plot", {"country": selected_country}, build)
 
-    # ─── Tab 3: Variability Analysis ───────────────────────
-    with tab3:
-        st.subheader("🔻 Countries with Decreasing Temperature Variability")
-        st.info("""
-        This chart compares the **standard deviation of temperature change** before and after 1993.
-        A **negative delta** indicates more stable climate conditions.
-        """)
+# ─── Tab 3: Variability Analysis ───────────────────────
+@view("🔻 Variability", needs=("country", "cube", "variability", "metrics"))
+def variability_tab(selected_country, cube, variability, metrics):
+    st.subheader("🔻 Countries with Decreasing Temperature Variability")
+    first_year, last_year = int(cube.years[0]), int(cube.years[-1])
+    split_year = st.slider("Split year", first_year + 2, last_year - 1, 1993)
+
+    st.info(f"""
+    This chart compares the **standard deviation of temperature change** before and after {split_year}.
+    A **negative delta** indicates more stable climate conditions.
+    """)
 
-        early = df_long[df_long["Year"] <= 1992].groupby("Country")["TempChange"].std().reset_index(name="Std_Early")
-        late = df_long[df_long["Year"] >= 1993].groupby("Country")["TempChange"].std().reset_index(name="Std_Late")
-        std_comp = early.merge(late, on="Country")
-        std_comp["Delta_Std"] = std_comp["Std_Late"] - std_comp["Std_Early"]
+    def build_split():
+        std_comp = variability.split(split_year)
         decreasing = std_comp[std_comp["Delta_Std"] < 0].sort_values("Delta_Std")
 
-        bar = alt.Chart(decreasing).mark_bar().encode(
-            x=alt.X("Delta_Std:Q", title="∆ Std Dev (1993–2024 − 1961–1992)"),
-            y=alt.Y("Country:N", sort="-x"),
-            color=alt.Color("Delta_Std:Q", scale=alt.Scale(scheme="viridis", domainMid=0)),
-            tooltip=["Country", "Std_Early", "Std_Late", "Delta_Std"]
-        ).properties(
-            height=500,
-            width=750,
-            title="Top Countries with Decreasing Yearly Temperature Variability"
-        )
+        decreasing = chart_frame(decreasing, ["Country", "Std_Early", "Std_Late", "Delta_Std"], "Variability")
+        return climate_charts.variability_chart(decreasing, split_year, first_year, last_year)
 
-        st.altair_chart(bar, use_container_width=True)
-
-    # ─── Tab 4: Developed vs Developing Comparison ─────────
-    with tab4:
-        st.subheader("🌍 Developed vs Developing: Temperature Comparison")
-        
-        st.write("""
-        Developed countries, often referred to as "high-income" nations, typically have advanced technological infrastructure,
-        high standards of living, and robust economies. Examples include the United States, Germany, and Japan.
-
-        Developing countries face challenges like limited access to education, healthcare, and infrastructure.
-        Examples include India, Nigeria, and Bangladesh.
-        """)
-
-        dev_sel = alt.selection_multi(fields=["DevStatus"], bind="legend")
-        dev_avg = df_long.groupby(["Year", "DevStatus"])["TempChange"].mean().reset_index()
-
-        line_chart = alt.Chart(dev_avg).mark_line(point=True).encode(
-            x=alt.X("Year:O"),
-            y=alt.Y("TempChange:Q", title="Avg Temp Change (°C)"),
-            color=alt.Color("DevStatus:N", scale=alt.Scale(domain=["Developed", "Developing"], range=["#2ca02c", "#ff7f0e"])),
-            opacity=alt.condition(dev_sel, alt.value(1.0), alt.value(0.15)),
-            tooltip=["Year", "DevStatus", "TempChange"]
-        ).add_params(dev_sel).properties(
-            title="Average Temp Change by Economic Status",
-            width=750,
-            height=400
-        )
+    snapshot_chart("Variability", {"split_year": split_year}, build_split)
 
-        st.altair_chart(line_chart, use_container_width=True)
-
-        df_long["YearGroup"] = (df_long["Year"] // 5) * 5
-        dev_bar = df_long.groupby(["YearGroup", "DevStatus"])["TempChange"].mean().reset_index()
-
-        bar_chart = alt.Chart(dev_bar).mark_bar().encode(
-            x=alt.X("YearGroup:O", title="5-Year Group"),
-            y=alt.Y("TempChange:Q", title="Avg Temp Change (°C)"),
-            color=alt.Color("DevStatus:N", scale=alt.Scale(domain=["Developed", "Developing"], range=["#2ca02c", "#ff7f0e"])),
-            opacity=alt.condition(dev_sel, alt.value(1.0), alt.value(0.25)),
-            tooltip=["YearGroup", "DevStatus", "TempChange"]
-        ).add_params(dev_sel).properties(
-            title="5-Year Avg Temp Change by Development Status",
-            width=750,
-            height=400
-        )
+    st.markdown("#### Rolling Variability")
+    window = st.slider("Window (years)", 5, 30, 10)
+
+    def build_rolling():
+        rolling_countries = metrics.sample_countries() if selected_country == "All" else [selected_country]
+        rolling = chart_frame(variability.rolling(rolling_countries, window), ["Country", "Year", "Rolling_Std"],
+                              "Rolling variability", x="Year", y="Rolling_Std", series="Country")
+        return climate_charts.rolling_chart(rolling, window)
+
+    snapshot_chart("Rolling variability", {"country": selected_country, "window": window}, build_rolling)
 
-        st.altair_chart(bar_chart, use_container_width=True)
+# ─── Tab 4: Developed vs Developing Comparison ─────────
+@view("🌍 Country Status", needs=("aggregates",))
+def status_tab(aggregates):
+    st.subheader("🌍 Developed vs Developing: Temperature Comparison")
+    
+    st.write("""
+    Developed countries, often referred to as "high-income" nations, typically have advanced technological infrastructure,
+    high standards of living, and robust economies. Examples include the United States, Germany, and Japan.
+
+    Developing countries face challenges like limited access to education, healthcare, and infrastructure.
+    Examples include India, Nigeria, and Bangladesh.
+    """)
+
+    col_dim, col_width = st.columns(2)
+    group_dim = col_dim.selectbox(
+        "Classification", aggregates.dimensions(),
+        format_func={"DevStatus": "Developed / Developing", "Region": "Region",
+                     "OECD_LDC": "OECD / LDC (food dataset)",
+                     "DevStaus": "Development status (food dataset)"}.get
+    )
+    bucket_width = col_width.select_slider("Years per group", options=[2, 5, 10, 20], value=5)
+
+    def build():
+        groups = aggregates.groups(group_dim)
+        dev_avg = chart_frame(aggregates.yearly(group_dim), ["Year", group_dim, "TempChange", "Count"],
+                              "Status by year", x="Year", y="TempChange", series=group_dim)
+        dev_bar = chart_frame(aggregates.bucketed(group_dim, bucket_width),
+                              ["YearGroup", group_dim, "TempChange", "Count", "Variance"], "Status by year group")
+        return climate_charts.status_charts(dev_avg, dev_bar, group_dim, groups, bucket_width)
+
+    snapshot_charts(["Status by year", "Status by year group"],
+                    {"group_dim": group_dim, "bucket_width": bucket_width}, build)
 
 # ─── Warming Gases Page ─────────────────────────────────────
-if page == "Warming Gases":
+@view("Warming Gases", needs=("country", "gas", "cube"))
+def gases_page(chart_country, gas, cube):
     st.subheader("🔥 Warming Contributions by Gas and Source")
     st.info("""
     This area chart shows **the warming impact of major greenhouse gases and emission sources over time**.
     Click the legend to highlight or filter different contributors.
     """)
 
-    # Set a default year range and country
+    # Set a default year range
     dev_year_range = (1961, 2004)  # You can add a sidebar slider later if needed
-    chart_country = selected_country if 'selected_country' in locals() else "All"
-
-    # Load gas data
-    gas_long = prepare_gas_data(df_long, dev_year_range, chart_country)
-
-    # Interactive selection logic
-    selection = alt.selection_point(fields=['series'])
-    condition = alt.condition(selection, 'series:N', alt.ColorValue('lightgray'))
-
-    # Area chart showing contribution by gas
-    area = alt.Chart(gas_long).mark_area(opacity=0.7).encode(
-        x=alt.X("Year:O", title="Year"),
-        y=alt.Y("Temp Change:Q", title="Temperature Change (°C)"),
-        color=condition,
-        order="series:N",
-        tooltip=['Year:O', 'Legend:N', 'Temp Change:Q']
-    ).add_params(selection).properties(
-        width=900,
-        height=500,
-        title="Warming Contributions by Gas Type and Emission Source"
-    )
+
+    entity = gas_entity(climate_data.resolve(gas), chart_country, cube)
+
+    def build():
+        gas_long = prepare_gas_data(gas, dev_year_range, entity)
+        # Stacked areas need every series on the same years, hence the x-aligned stride
+        gas_long = chart_frame(gas_long, ["Year", "series", "Legend", "Temp Change"], "Warming gases",
+                               x="Year", y="Temp Change", series="series", method="stride")
+        return climate_charts.gas_chart(gas_long)
 
     # Explanation and chart rendering
     st.markdown("""
@@ -405,15 +462,147 @@ if page == "Warming Gases":
     - Solutions include transitioning to renewable energy, electrification of transportation, and adopting energy-efficient technologies.
     """)
 
-    st.altair_chart(area, use_container_width=True)
+    snapshot_chart("Warming gases", {"entity": entity, "years": dev_year_range}, build)
+
+# ─── Monthly Explorer Page ──────────────────────────────────
+@view("Monthly Explorer", needs=("country", "monthly", "cube"))
+def monthly_page(selected_country, monthly, cube):
+    st.subheader("📅 Monthly Temperature Explorer")
+    st.info("""
+    Monthly average surface temperatures since 1950. Compare **seasonal cycles** across years,
+    see how each month has shifted against the **1951–1980 baseline**, and spot warm and cold spells in the **anomaly heatmap**.
+    """)
+
+    default_entity = monthly.entity_for(selected_country, country_iso3(cube, selected_country)) or "World"
+    entity = st.selectbox("Region or country", monthly.entities, index=monthly.entity_index[default_entity])
+
+    first_year, last_year = int(monthly.years[0]), int(monthly.years[-1])
+    year_range = st.slider("Years", first_year, last_year, (first_year, last_year))
+
+    # Seasonal cycles for a few chosen years
+    cycle_years = st.multiselect(
+        "Compare seasonal cycles for", monthly.years.tolist(),
+        default=[y for y in (1960, 1990, last_year - 1) if first_year <= y <= last_year]
+    )
+    def build_cycles():
+        cols = [int(np.searchsorted(monthly.years, y)) for y in cycle_years]
+        cycles = monthly.month_frame(monthly.grid(entity)[:, cols], cycle_years, "Temperature")
+        cycles = chart_frame(cycles, ["Month", "Year", "Temperature"], "Seasonal cycles")
+        return climate_charts.cycle_chart(cycles, entity)
+
+    snapshot_chart("Seasonal cycles", {"entity": entity, "years": cycle_years}, build_cycles)
+
+    # Month-of-year climatology: baseline vs selected range
+    def build_climatology():
+        climatology = climate_charts.climatology_frame(
+            monthly.climatology(entity, 1951, 1980), monthly.climatology(entity, *year_range), year_range
+        )
+        climatology = chart_frame(climatology, ["Month", "Period", "Temperature"], "Climatology")
+        return climate_charts.climatology_chart(climatology)
+
+    snapshot_chart("Climatology", {"entity": entity, "years": year_range}, build_climatology)
+
+    # Anomaly heatmap
+    def build_heatmap():
+        span = monthly.year_slice(*year_range)
+        heat = monthly.month_frame(monthly.anomalies(entity, start=year_range[0], stop=year_range[1]),
+                                   monthly.years[span], "Anomaly")
+        heat = chart_frame(heat, ["Month", "Year", "Anomaly"], "Anomaly heatmap")
+        return climate_charts.anomaly_heatmap(heat, entity)
+
+    snapshot_chart("Anomaly heatmap", {"entity": entity, "years": year_range}, build_heatmap)
+
+# ─── Contributions Page ─────────────────────────────────────
+@view("Contributions", needs=("country", "contributions", "cube"))
+def contributions_page(selected_country, contributions, cube):
+    st.subheader("🏭 Contributions to Global Warming")
+    st.info("""
+    Each country's **share of cumulative global warming** from its historical emissions, since 1851.
+    See who has contributed most in any year, how the **rankings** have shifted, and how the **shares** have grown.
+    """)
+
+    first_year, last_year = int(contributions.years[0]), int(contributions.years[-1])
+    col_year, col_n = st.columns(2)
+    year = col_year.slider("Year", first_year, last_year, last_year)
+    top_n = col_n.slider("Top contributors", 5, 25, 10)
+
+    # Top N in the chosen year: a slice of that year's precomputed rank order
+    top_entities = contributions.top(year, top_n)["Entity"].tolist()
+    snapshot_chart("Top contributors", {"year": year, "top_n": top_n}, lambda: climate_charts.contribution_bar_chart(
+        chart_frame(contributions.top(year, top_n), ["Rank", "Entity", "Share"], "Top contributors"), year
+    ))
+
+    # Rank trajectories
+    tracked_default = top_entities[:5]
+    entity = contributions.entity_for(selected_country, country_iso3(cube, selected_country))
+    if entity is not None and contributions.ranked[contributions.entity_index[entity]] and entity not in tracked_default:
+        tracked_default.append(entity)
+    tracked = st.multiselect("Track rankings for", contributions.entities[contributions.ranked].tolist(),
+                             default=tracked_default)
+    if tracked:
+        snapshot_chart("Contribution ranks", {"tracked": tracked}, lambda: climate_charts.rank_chart(
+            chart_frame(contributions.rank_frame(tracked), ["Entity", "Year", "Rank"], "Contribution ranks",
+                        x="Year", y="Rank", series="Entity")
+        ))
+
+    # Share-over-time stack of this year's top N, topped up by the rest of the world
+    snapshot_chart("Contribution shares", {"year": year, "top_n": top_n}, lambda: climate_charts.share_stack_chart(
+        chart_frame(contributions.share_frame(top_entities), ["Entity", "Year", "Share"],
+                    "Contribution shares", x="Year", y="Share", series="Entity", method="stride")
+    ))
+
+# ─── Food & Climate Page ─────────────────────────────────────
+@view("Food & Climate", needs=("country", "food", "food_correlations", "cube"))
+def food_page(selected_country, food, correlations, cube):
+    st.subheader("🌾 Temperature Change vs Food Production")
+    st.info("""
+    Does a hotter year go with weaker food production? For each country, this page correlates the **annual temperature change**
+    with its **food production growth** or **production value**, optionally **lagged** to look for delayed effects.
+    Correlation is not causation: treat strong values as leads to investigate.
+    """)
+
+    col_metric, col_lag, col_years = st.columns(3)
+    metric = col_metric.selectbox("Food metric", correlations.metrics, format_func=FOOD_METRIC_LABELS.get)
+    lag = col_lag.slider("Lag (years)", int(correlations.lags[0]), int(correlations.lags[-1]), 0,
+                         help="Positive: food figure from that many years after the temperature")
+    min_years = col_years.slider("Minimum overlapping years", 5, 50, 20)
+
+    # Sortable table of precomputed correlations, strongest first
+    table = correlations.table(metric, lag, min_years)
+    st.markdown(f"#### Correlation by Country ({len(table)} countries)")
+    st.dataframe(
+        table, hide_index=True, height=300,
+        column_config={"r": st.column_config.ProgressColumn("r", min_value=-1, max_value=1, format="%.3f")},
+    )
+
+    if table.empty:
+        st.warning("No country has enough overlapping years; lower the minimum.")
+        return
+
+    default_country = food.entity_for(selected_country, country_iso3(cube, selected_country))
+    options = table["Country"].tolist()
+    country = st.selectbox("Country", options,
+                           index=options.index(default_country) if default_country in options else 0)
+
+    def build():
+        label = FOOD_METRIC_LABELS[metric]
+        pairs = food.pairs(country, metric, lag).rename(columns={metric: "Food"})
+        pairs = chart_frame(pairs, ["Year", "TempChange", "Food"], "Food scatter")
+        profile = chart_frame(correlations.lag_profile(country, metric), ["Lag", "r", "Years"], "Lag profile")
+        return (climate_charts.food_scatter_chart(pairs, label, country, lag),
+                climate_charts.lag_profile_chart(profile, lag))
+
+    snapshot_charts(["Food scatter", "Lag profile"], {"country": country, "metric": metric, "lag": lag}, build)
 
 # ─── Roydan to add Content ───────────────────────────────────
-if page == "Placeholder":
+@view("Placeholder")
+def placeholder_page():
     st.title("Placeholder Page")
     st.write("This is a placeholder page. You can add content here later.")
 
 # ─── Chat Assistant Page ────────────────────────────────
-if page == "Chat Assistant":
+@view("Chat Assistant")
+def chat_page():
     st.subheader("🧠 ClimateBot Assistant")
     st.markdown("""
     Ask **ClimateBot** about:
@@ -442,27 +631,41 @@ if page == "Chat Assistant":
         st.chat_message("user").markdown(prompt)
         st.session_state.chat_history.append({"role": "user", "content": prompt})
 
-        # Hard-coded Q&A for demonstration
-        response = ""
-        q = prompt.lower()
-
-        if "highest temp" in q and "country" in q:
-            response = "The country with the highest recorded temperature change in 1998 was likely a high-latitude nation like Russia or Canada, but exact values depend on the dataset."
-        elif "variability" in q:
-            response = (
-                "Variability refers to how much temperatures fluctuate year to year. "
-                "Less variability means more climate stability, which can affect ecosystems and planning."
-            )
-        elif "developed" in q and "developing" in q:
-            response = (
-                "Developed countries often show earlier increases due to industrialization. "
-                "Developing countries are now experiencing steeper rises due to economic growth and emissions."
-            )
-        else:
-            response = "Great question! Try asking about a specific year, country, or trend type. I'm still learning! 🤖"
+        # Answered offline from the precomputed indexes, never from chat history.
+        # The bot is only resolved once a question arrives.
+        response = inputs["bot"].answer(prompt)
 
         st.chat_message("assistant").markdown(response)
         st.session_state.chat_history.append({"role": "assistant", "content": response})
+        # Only the most recent exchanges are kept and re-rendered on each rerun
+        del st.session_state.chat_history[:-CHAT_HISTORY_LIMIT]
+
+# ─── Page Dispatch ─────────────────────────────────────────
+if page not in ["Home", "Chat Assistant"]:
+    inputs["country"]  # Sidebar filters show on every data page
+
+if page == "Explore Trends":
+    # Lazy tabs: switching tabs reruns the script and only the open tab renders
+    for label, tab in zip(EXPLORE_TABS, st.tabs(EXPLORE_TABS, key="explore_tab", on_change="rerun")):
+        if tab.open:
+            with tab:
+                render_view(label)
+else:
+    render_view(page)
+
+# ─── Chart Payload Report ──────────────────────────────────
+# A developer panel, shown with the stage timings
+if stage_timing.TIMINGS_ENABLED and chart_reports:
+    with st.sidebar.expander("📦 Chart payload"):
+        saved = sum(r.bytes_in - r.bytes_out for r in chart_reports)
+        st.caption(f"Point budget {chart_data.CHART_POINT_BUDGET:,} per chart • ~{saved / 1024:,.0f} KB saved this run")
+        st.dataframe(pd.DataFrame(chart_reports), hide_index=True)
+
+# ─── Stage Timing Panel ──────────────────────────────────
+if stage_timing.TIMINGS_ENABLED:
+    with st.sidebar.expander("⏱️ Stage timings", expanded=True):
+        st.caption(f"This rerun: {timer.elapsed_ms():,.0f} ms • outer stages include nested ones")
+        st.dataframe(timer.frame()[["stage", "ms"]].round(1), hide_index=True)
 
 # ─── Footer ────────────────────────────────────────────────
 st.markdown("---")
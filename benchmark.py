@@ -0,0 +1,417 @@
+# 🌍 DASHBOARD BENCHMARK
+# Times the dashboard's data and chart pipeline without a Streamlit server, on
+# the bundled CSVs and on synthetic copies scaled up in countries and years.
+#
+#   python benchmark.py                          # bundled data, 10× and 100× countries
+#   python benchmark.py --scales 1 1000 10x10 --repeat 5 --out results.csv
+#
+# A scale "C" multiplies the countries by C; "CxY" also multiplies the years
+# by Y. Every scale runs once cold (empty cache directory: CSV parsing, cache
+# build and shared-array publish), --repeat times warm (cache on disk, fresh
+# in-process objects, as in a new server process), then once more cold under
+# tracemalloc for peak memory, ingesting in-process so that CSV parsing is
+# counted. The refresh column times the run after a data update: the
+# previous release (one year less in the indicator and monthly files) is
+# cached and loaded, then this release replaces it in place, so
+# the indicator's appended years are ingested and derived incrementally; the
+# monthly cube is rebuilt, which costs no more than checking it would. Cache
+# directories are temporary, so the dashboard's own .data_cache/ is never
+# touched.
+#
+#   python benchmark.py --check                  # refresh == cold build, no timing
+#
+# --check runs the refresh against a cold build of the same files for each
+# kind of release (REFRESH_CASES), past values revised included, and exits
+# non-zero if any derived array differs.
+import argparse
+import shutil
+import tempfile
+from pathlib import Path
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+import chart_data
+import climate_charts
+import climate_data
+import climate_stats
+from stage_timing import StageTimer
+
+# Scaled copies of the food table keep only the columns its schema requires,
+# so 1000× stays a few hundred MB instead of gigabytes.
+FOOD_COLUMNS = list(climate_data.SCHEMAS["food"].columns)
+
+# Sources that gain year columns with each release
+APPENDED_CSVS = [climate_data.INDICATOR_CSV, climate_data.MONTHLY_CSV]
+
+
+# ─── Synthetic Data ───────────────────────────────
+def parse_scale(spec):
+    """'10' -> (10, 1); '10x5' -> (10, 5)."""
+    countries, _, years = spec.lower().partition("x")
+    return int(countries), int(years or 1)
+
+
+def _jitter(values, rng):
+    # Copies get small noise so per-country statistics are not identical
+    return np.round(values + rng.normal(0, 0.05, values.shape), 3)
+
+
+def scale_indicator(src, dst, countries, years, rng):
+    """Wide indicator CSV with `countries`× the rows and `years`× the year columns.
+
+    Copies keep their ISO3 code, so they classify into the same groups, and
+    get a " #k" suffix on the country name; extra years continue the range.
+    """
+    df = pd.read_csv(src)
+    year_cols = [c for c in df.columns if c.isdigit()]
+    first, span = int(year_cols[0]), len(year_cols)
+    values = df[year_cols].to_numpy(dtype=np.float64)
+
+    parts = []
+    for k in range(countries):
+        ids = df.drop(columns=year_cols)
+        if k:
+            ids["Country"] = ids["Country"] + f" #{k}"
+        block = np.hstack([values if (k == 0 and j == 0) else _jitter(values, rng) for j in range(years)])
+        labels = [str(first + i) for i in range(span * years)]
+        parts.append(pd.concat([ids, pd.DataFrame(block, columns=labels)], axis=1))
+    out = pd.concat(parts, ignore_index=True)
+    out["ObjectId"] = np.arange(1, len(out) + 1)
+    out.to_csv(dst, index=False)
+
+
+def scale_food(src, dst, countries, years, rng):
+    """Long food CSV scaled like scale_indicator, reduced to FOOD_COLUMNS."""
+    df = pd.read_csv(src, index_col=0)[FOOD_COLUMNS]
+    span = int(df["Year"].max()) - int(df["Year"].min()) + 1
+
+    parts = []
+    for k in range(countries):
+        for j in range(years):
+            part = df.copy()
+            if k:
+                part["Entity"] = part["Entity"] + f" #{k}"
+                part["Country"] = part["Country"] + f" #{k}"
+            if k or j:
+                part["Year"] = part["Year"] + j * span
+                part["TempChange"] = _jitter(part["TempChange"].to_numpy(dtype=np.float64), rng)
+            parts.append(part)
+    pd.concat(parts, ignore_index=True).to_csv(dst)
+
+
+def make_dataset(source, root, countries, years, seed=0):
+    """A data directory with scaled indicator and food CSVs; other sources are linked."""
+    rng = np.random.default_rng(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    scale_indicator(source / climate_data.INDICATOR_CSV, root / climate_data.INDICATOR_CSV, countries, years, rng)
+    scale_food(source / climate_data.FOOD_CSV, root / climate_data.FOOD_CSV, countries, years, rng)
+    for name in (climate_data.GAS_CSV, climate_data.CONTRIBUTIONS_CSV, climate_data.MONTHLY_CSV, climate_data.GROUPS_CSV):
+        (root / name).symlink_to(source / name)
+    return root
+
+
+def previous_release(data_dir, root, appended=True, revised=False):
+    """A copy of data_dir as the release before it.
+
+    With `appended`, the last year column of the wide sources is dropped;
+    with `revised`, the first value of their first year differs, so the
+    current release revises a past year.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    for name in (climate_data.GAS_CSV, climate_data.CONTRIBUTIONS_CSV, climate_data.FOOD_CSV, climate_data.GROUPS_CSV):
+        (root / name).symlink_to(Path(data_dir).resolve() / name)
+    for name in APPENDED_CSVS:
+        df = pd.read_csv(Path(data_dir) / name, dtype=str, keep_default_na=False)
+        years = sorted((c for c in df.columns if c.isdigit()), key=int)
+        if revised:
+            df.loc[0, years[0]] = "9.999"
+        if appended:
+            df = df.drop(columns=[years[-1]])
+        df.to_csv(root / name, index=False)
+    return root
+
+
+def release(previous, data_dir):
+    """Replace the previous release's changing sources in place with data_dir's."""
+    for name in APPENDED_CSVS:
+        (previous / name).unlink()
+        shutil.copy(Path(data_dir) / name, previous / name)
+
+
+def use_dirs(data_dir, cache_dir):
+    climate_data.DATA_DIR = Path(data_dir)
+    climate_data.CACHE_DIR = Path(cache_dir)
+    climate_data.SHARED_DIR = Path(cache_dir) / "shared"
+
+
+# ─── Pipeline ─────────────────────────────────────
+def _reduce(df, fields, **reduce_args):
+    return chart_data.reduce_for_chart(df, fields, **reduce_args)[0]
+
+
+def run_pipeline(timer, new_process=True, ingest_workers=None):
+    """Load, derive and chart every view's default state, as the dashboard does.
+
+    Returns {chart label: (chart, rows embedded)}; chart serialization is
+    timed separately by measure_charts(). With new_process=False, datasets
+    registered by earlier runs stay, as in a server picking up new data.
+    `ingest_workers` is passed to climate_data.ingest().
+    """
+    if new_process:
+        climate_data.clear_datasets()
+    with timer.stage("ingest"):
+        climate_data.ingest(workers=ingest_workers)
+    with timer.stage("load_data"):
+        cube = climate_data.resolve(climate_data.load_indicator_cube())
+    indicator = cube.shared_as
+    with timer.stage("metrics"):
+        metrics = climate_stats.TrendMetrics(cube)
+    with timer.stage("variability"):
+        variability = climate_stats.VariabilityEngine(cube)
+    with timer.stage("aggregates"):
+        aggregates = climate_data.resolve(climate_stats.build_aggregates(indicator))
+    with timer.stage("load_gas"):
+        gas = climate_data.load_gas()
+    with timer.stage("load_monthly"):
+        monthly = climate_data.load_monthly()
+    with timer.stage("load_contributions"):
+        contributions = climate_data.load_contributions()
+    with timer.stage("load_food_panel"):
+        food = climate_data.load_food_panel()
+    with timer.stage("food correlations"):
+        correlations = climate_stats.FoodCorrelations(food)
+
+    charts = {}
+    with timer.stage("yoy"):
+        yoy = metrics.yoy_frame(metrics.sample_countries())
+        scatter = _reduce(yoy, ["Country", "Year", "TempChange"], x="Year", y="TempChange", series="Country")
+        yoy = _reduce(yoy, ["Year", "Country", "YoY_Change"], x="Year", y="YoY_Change", series="Country")
+        charts["Year-over-year"] = climate_charts.yoy_chart(yoy, scatter, "All"), len(yoy) + len(scatter)
+        metrics.fastest_warming(10)
+
+    with timer.stage("scatter"):
+        data = _reduce(cube.frame(cube.countries[~cube.aggregate][:10]), ["Country", "Year", "TempChange"],
+                       x="Year", y="TempChange", series="Country")
+        charts["Scatter plot"] = climate_charts.scatter_chart(data, "All"), len(data)
+
+    with timer.stage("variability split"):
+        first_year, last_year = int(cube.years[0]), int(cube.years[-1])
+        split_year = min(max(1993, first_year + 2), last_year - 1)
+        std_comp = variability.split(split_year)
+        decreasing = std_comp[std_comp["Delta_Std"] < 0].sort_values("Delta_Std")
+        decreasing = _reduce(decreasing, ["Country", "Std_Early", "Std_Late", "Delta_Std"])
+        charts["Variability"] = (climate_charts.variability_chart(decreasing, split_year, first_year, last_year),
+                                 len(decreasing))
+
+    with timer.stage("variability rolling"):
+        rolling = _reduce(variability.rolling(metrics.sample_countries(), 10), ["Country", "Year", "Rolling_Std"],
+                          x="Year", y="Rolling_Std", series="Country")
+        charts["Rolling variability"] = climate_charts.rolling_chart(rolling, 10), len(rolling)
+
+    with timer.stage("status aggregates"):
+        dev_avg = _reduce(aggregates.yearly("DevStatus"), ["Year", "DevStatus", "TempChange", "Count"],
+                          x="Year", y="TempChange", series="DevStatus")
+        dev_bar = _reduce(aggregates.bucketed("DevStatus", 5),
+                          ["YearGroup", "DevStatus", "TempChange", "Count", "Variance"])
+        line, bar = climate_charts.status_charts(dev_avg, dev_bar, "DevStatus", aggregates.groups("DevStatus"), 5)
+        charts["Status by year"] = line, len(dev_avg)
+        charts["Status by year group"] = bar, len(dev_bar)
+
+    with timer.stage("prepare_gas_data"):
+        # The dashboard's "All" selection resolves to the World entity
+        gas_long = _reduce(gas.long("World", (1961, 2004)), ["Year", "series", "Legend", "Temp Change"],
+                           x="Year", y="Temp Change", series="series", method="stride")
+        charts["Warming gases"] = climate_charts.gas_chart(gas_long), len(gas_long)
+
+    with timer.stage("monthly"):
+        entity = "World"
+        first, last = int(monthly.years[0]), int(monthly.years[-1])
+        cycle_years = [y for y in (1960, 1990, last - 1) if first <= y <= last]
+        cols = [int(np.searchsorted(monthly.years, y)) for y in cycle_years]
+        cycles = monthly.month_frame(monthly.grid(entity)[:, cols], cycle_years, "Temperature")
+        climatology = climate_charts.climatology_frame(
+            monthly.climatology(entity, 1951, 1980), monthly.climatology(entity, first, last), (first, last)
+        )
+        heat = monthly.month_frame(monthly.anomalies(entity), monthly.years, "Anomaly")
+        charts["Seasonal cycles"] = climate_charts.cycle_chart(cycles, entity), len(cycles)
+        charts["Climatology"] = climate_charts.climatology_chart(climatology), len(climatology)
+        charts["Anomaly heatmap"] = climate_charts.anomaly_heatmap(heat, entity), len(heat)
+
+    with timer.stage("contributions"):
+        year = int(contributions.years[-1])
+        top = _reduce(contributions.top(year, 10), ["Rank", "Entity", "Share"])
+        ranks = _reduce(contributions.rank_frame(top["Entity"].head(5).tolist()), ["Entity", "Year", "Rank"],
+                        x="Year", y="Rank", series="Entity")
+        shares = _reduce(contributions.share_frame(top["Entity"].tolist()), ["Entity", "Year", "Share"],
+                         x="Year", y="Share", series="Entity", method="stride")
+        charts["Top contributors"] = climate_charts.contribution_bar_chart(top, year), len(top)
+        charts["Contribution ranks"] = climate_charts.rank_chart(ranks), len(ranks)
+        charts["Contribution shares"] = climate_charts.share_stack_chart(shares), len(shares)
+
+    with timer.stage("food & climate"):
+        metric = correlations.metrics[0]
+        table = correlations.table(metric, 0, 20)
+        country = table["Country"].iloc[0]
+        pairs = _reduce(food.pairs(country, metric, 0).rename(columns={metric: "Food"}),
+                        ["Year", "TempChange", "Food"])
+        profile = _reduce(correlations.lag_profile(country, metric), ["Lag", "r", "Years"])
+        charts["Food scatter"] = climate_charts.food_scatter_chart(pairs, metric, country, 0), len(pairs)
+        charts["Food lag profile"] = climate_charts.lag_profile_chart(profile, 0), len(profile)
+
+    return charts
+
+
+def measure_charts(charts, timer):
+    """Serialize each chart to Vega-Lite JSON; returns one row per chart."""
+    rows = []
+    for label, (chart, points) in charts.items():
+        with timer.stage(f"chart: {label}"):
+            spec = chart.to_json()
+        rows.append({"chart": label, "rows": points, "json_kb": len(spec.encode()) / 1024})
+    return pd.DataFrame(rows)
+
+
+# ─── Refresh Check ────────────────────────────────
+# (label, previous_release arguments) for each kind of release checked
+REFRESH_CASES = [
+    ("appended year", {"appended": True, "revised": False}),
+    ("appended year, past value revised", {"appended": True, "revised": True}),
+    ("past value revised", {"appended": False, "revised": True}),
+]
+
+
+def derived_arrays(new_process=True):
+    """Every array a refresh must reproduce, by name, for the current data directory."""
+    if new_process:
+        climate_data.clear_datasets()
+    climate_data.ingest()
+    handle = climate_data.load_indicator_cube()
+    cube = climate_data.resolve(handle)
+    metrics = climate_stats.TrendMetrics(cube)
+    variability = climate_stats.VariabilityEngine(cube)
+    aggregates = climate_data.resolve(climate_stats.build_aggregates(handle))
+    monthly = climate_data.load_monthly()
+
+    arrays = {
+        "indicator years": cube.years, "indicator values": cube.values,
+        "trend slope": metrics.slope, "trend intercept": metrics.intercept, "yoy": metrics.yoy,
+        "variability n": variability.n, "variability s1": variability.s1, "variability s2": variability.s2,
+        "monthly years": monthly.years, "monthly values": monthly.values,
+    }
+    for dim in aggregates.dimensions():
+        yearly = aggregates.yearly(dim)
+        arrays[f"aggregates {dim}"] = yearly.select_dtypes("number").to_numpy(dtype=np.float64)
+    return arrays
+
+
+def check_refresh(data_dir):
+    """Refresh each REFRESH_CASES release to data_dir and compare with a cold build.
+
+    Returns {case label: names of the arrays that differ}.
+    """
+    failures = {}
+    with tempfile.TemporaryDirectory(prefix="bench-check-") as cache:
+        use_dirs(data_dir, Path(cache) / "cold")
+        cold = derived_arrays()
+        for i, (label, args) in enumerate(REFRESH_CASES):
+            previous = previous_release(data_dir, Path(cache) / f"previous-{i}", **args)
+            use_dirs(previous, Path(cache) / f"refresh-{i}")
+            derived_arrays()
+            release(previous, data_dir)
+            refreshed = derived_arrays(new_process=False)
+            failures[label] = [
+                name for name, values in cold.items()
+                if np.shape(values) != np.shape(refreshed[name])
+                or not np.allclose(values, refreshed[name], rtol=1e-9, atol=1e-12, equal_nan=True)
+            ]
+    return failures
+
+
+# ─── Runs ─────────────────────────────────────────
+def bench_scale(data_dir, repeat):
+    """Cold, warm, refresh and traced-cold runs over one data directory; returns (stages, charts)."""
+    with tempfile.TemporaryDirectory(prefix="bench-cache-") as cache:
+        use_dirs(data_dir, Path(cache) / "cold")
+        cold = StageTimer()
+        charts = measure_charts(run_pipeline(cold), cold)
+
+        warm = []
+        for _ in range(repeat):
+            timer = StageTimer()
+            measure_charts(run_pipeline(timer), timer)
+            warm.append(timer.frame().set_index("stage")["ms"])
+
+        previous = previous_release(data_dir, Path(cache) / "previous")
+        use_dirs(previous, Path(cache) / "refresh")
+        run_pipeline(StageTimer())
+        release(previous, data_dir)
+        refresh = StageTimer()
+        measure_charts(run_pipeline(refresh, new_process=False), refresh)
+
+        use_dirs(data_dir, Path(cache) / "traced")
+        traced = StageTimer(memory=True)
+        try:
+            # tracemalloc only sees this process, so the caches are built inline
+            measure_charts(run_pipeline(traced, ingest_workers=1), traced)
+        finally:
+            # Tracing slows every allocation, later scales' timed runs included
+            traced.stop()
+
+    stages = pd.DataFrame({
+        "cold_ms": cold.frame().set_index("stage")["ms"],
+        "warm_ms": pd.concat(warm, axis=1).median(axis=1),
+        "peak_mb": traced.frame().set_index("stage")["peak_mb"],
+        "refresh_ms": refresh.frame().set_index("stage")["ms"],
+    })
+    stages.loc["total"] = [stages["cold_ms"].sum(), stages["warm_ms"].sum(), stages["peak_mb"].max(),
+                           stages["refresh_ms"].sum()]
+    return stages.round(1), charts.round(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard's data and chart pipeline.")
+    parser.add_argument("--scales", nargs="+", default=["1", "10", "100"],
+                        help='"C" scales countries by C, "CxY" also scales years by Y (default: 1 10 100)')
+    parser.add_argument("--repeat", type=int, default=3, help="warm runs per scale (median is reported)")
+    parser.add_argument("--out", help="also write all stage timings to this CSV")
+    parser.add_argument("--check", action="store_true",
+                        help="check that refreshing to each scale matches a cold build, instead of timing")
+    args = parser.parse_args()
+
+    # Measure the whole payload, not Altair's 5000-row guard
+    alt.data_transformers.disable_max_rows()
+    source, cache_dir = climate_data.DATA_DIR, climate_data.CACHE_DIR
+    results, failed = [], False
+    with tempfile.TemporaryDirectory(prefix="bench-data-") as scratch:
+        for spec in args.scales:
+            countries, years = parse_scale(spec)
+            if (countries, years) == (1, 1):
+                data_dir = source
+            else:
+                data_dir = make_dataset(source, Path(scratch) / spec, countries, years)
+
+            print(f"\n=== {spec}: {countries}× countries, {years}× years ===")
+            if args.check:
+                for label, differ in check_refresh(data_dir).items():
+                    print(f"refresh, {label}: " + (f"DIFFERS in {', '.join(differ)}" if differ else "ok"))
+                    failed = failed or bool(differ)
+            else:
+                stages, charts = bench_scale(data_dir, args.repeat)
+                print(stages.to_string())
+                print(charts.to_string(index=False))
+                results.append(stages.reset_index().assign(scale=spec))
+
+            if data_dir != source:
+                shutil.rmtree(data_dir, ignore_errors=True)
+    use_dirs(source, cache_dir)
+
+    if args.out and results:
+        pd.concat(results, ignore_index=True).to_csv(args.out, index=False)
+    if failed:
+        raise SystemExit("refresh does not match a cold build")
+
+
+if __name__ == "__main__":
+    main()
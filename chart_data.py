@@ -0,0 +1,98 @@
+# 🌍 CHART DATA REDUCTION
+# Sits between the data layer and st.altair_chart. Altair inlines the chart
+# data as JSON on every render, so frames are cut down to the encoded fields
+# and, past a point budget, downsampled per series before they are embedded.
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+CHART_POINT_BUDGET = int(os.environ.get("CHART_POINT_BUDGET", 5000))
+
+PayloadReport = namedtuple("PayloadReport", ["label", "rows_in", "rows_out", "bytes_in", "bytes_out"])
+
+
+# ─── Downsampling ─────────────────────────────────
+def lttb(x, y, n_out):
+    """Indices of the Largest-Triangle-Three-Buckets sample of (x, y)."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (n_out - 2)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        lo, hi = int(i * every) + 1, int((i + 1) * every) + 1
+        # The next bucket's centroid is the third vertex of each triangle
+        nlo, nhi = hi, min(int((i + 2) * every) + 1, n)
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[prev] - cx) * (y[lo:hi] - y[prev]) - (x[prev] - x[lo:hi]) * (cy - y[prev]))
+        prev = lo + int(np.argmax(area))
+        keep[i + 1] = prev
+    return keep
+
+
+def minmax(x, y, n_out):
+    """Indices of the min and max of y in each of n_out/2 equal-count buckets."""
+    n = len(x)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+    edges = np.linspace(0, n, n_out // 2 + 1).astype(int)
+    keep = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi > lo:
+            keep += [lo + int(np.argmin(y[lo:hi])), lo + int(np.argmax(y[lo:hi]))]
+    return np.unique(keep)
+
+
+def stride(x, n_out):
+    """Every k-th distinct x value, so stacked series stay aligned on x."""
+    values = np.unique(x)
+    if n_out >= len(values):
+        return np.arange(len(x))
+    step = int(np.ceil(len(values) / n_out))
+    return np.flatnonzero(np.isin(x, values[::step]))
+
+
+# ─── Payload Budgeting ────────────────────────────
+def estimate_json_bytes(df, sample=200):
+    """Inline JSON size of df, extrapolated from the first `sample` records."""
+    if df.empty:
+        return 2
+    head = df.head(sample)
+    return int(len(head.to_json(orient="records")) / len(head) * len(df))
+
+
+def reduce_for_chart(df, fields, x=None, y=None, series=None, budget=CHART_POINT_BUDGET, method="lttb", label=""):
+    """Project df to the encoded `fields` and downsample to about `budget` points.
+
+    `series` rows are downsampled independently with the budget split evenly
+    between them; method is "lttb", "minmax" or "stride" (x-aligned, for
+    stacked charts). Returns (frame, PayloadReport).
+    """
+    fields = list(dict.fromkeys(fields))
+    data = df[fields]
+    if y is not None:
+        data = data[data[y].notna()]
+
+    if x is not None and y is not None and len(data) > budget:
+        groups = [data] if series is None else [g for _, g in data.groupby(series, observed=True, sort=False)]
+        per_series = max(budget // len(groups), 3)
+        parts = []
+        for group in groups:
+            group = group.sort_values(x, kind="stable")
+            gx = group[x].to_numpy(dtype=np.float64)
+            if method == "stride":
+                keep = stride(gx, per_series)
+            elif method == "minmax":
+                keep = minmax(gx, group[y].to_numpy(dtype=np.float64), per_series)
+            else:
+                keep = lttb(gx, group[y].to_numpy(dtype=np.float64), per_series)
+            parts.append(group.iloc[keep])
+        data = pd.concat(parts)
+
+    report = PayloadReport(label, len(df), len(data), estimate_json_bytes(df), estimate_json_bytes(data))
+    return data, report
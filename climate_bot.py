@@ -0,0 +1,301 @@
+# 🌍 CLIMATEBOT QUERY ENGINE
+# Offline question answering for the Chat Assistant page. A small rule-based
+# parser pulls country, year, metric and comparison out of the question and
+# compiles it into lookups on indexes built once from the data layer:
+# per-year sorted country orders, per-country series, trend metrics and
+# group aggregates. No LLM or network service is involved.
+import re
+from collections import namedtuple
+
+import numpy as np
+
+Query = namedtuple("Query", ["intent", "countries", "years", "extreme", "k", "metric"])
+
+# Everyday names for countries whose dataset names are formal
+COUNTRY_ALIASES = {
+    "usa": "United States", "u.s.": "United States", "united states of america": "United States",
+    "uk": "United Kingdom", "britain": "United Kingdom", "great britain": "United Kingdom",
+    "england": "United Kingdom",
+    "russia": "Russian Federation",
+    "china": "China, P.R.: Mainland", "hong kong": "China, P.R.: Hong Kong", "macao": "China, P.R.: Macao",
+    "south korea": "Korea, Rep. of", "korea": "Korea, Rep. of", "north korea": "Korea, Dem. People's Rep. of",
+    "iran": "Iran, Islamic Rep. of", "egypt": "Egypt, Arab Rep. of", "syria": "Syrian Arab Rep.",
+    "congo": "Congo, Rep. of", "drc": "Congo, Dem. Rep. of the", "laos": "Lao People's Dem. Rep.",
+    "taiwan": "Taiwan Province of China", "vatican": "Holy See", "palestine": "West Bank and Gaza",
+    "czechia": "Czech Rep.", "slovakia": "Slovak Rep.", "kyrgyzstan": "Kyrgyz Rep.",
+    "the whole world": "World", "globally": "World",
+}
+
+# ISO3 codes that are also everyday words ("Can you...", "per year", "Mar")
+ISO3_WORDS = {"AND", "ARE", "BEN", "CAN", "COM", "CUB", "DOM", "FIN", "GAB", "GIN", "GUY", "LIE", "MAC",
+              "MAR", "MUS", "NOR", "PAN", "PER", "SUR", "TON", "TUN"}
+
+HIGH_WORDS = r"highest|hottest|warmest|warmer|hotter|higher|most|largest|biggest|greatest|max(?:imum)?"
+LOW_WORDS = r"lowest|coldest|coolest|colder|cooler|lower|least|smallest|slowest|min(?:imum)?"
+
+HELP = (
+    "I can answer questions like:\n"
+    "- *Which country had the highest temp change in 1998?*\n"
+    "- *What was the temperature change in France in 2020?*\n"
+    "- *Which countries are warming fastest?*\n"
+    "- *Compare Canada and Brazil*\n"
+    "- *Compare developing vs developed warming patterns*"
+)
+
+
+def _fmt(value):
+    return "no data" if value is None or np.isnan(value) else f"{value:+.2f} °C"
+
+
+class ClimateBot:
+    """Answers temperature questions from precomputed indexes in milliseconds.
+
+    `cube` is a TempCube and `metrics` a TrendMetrics; `aggregates` (an
+    AggregateStore with a DevStatus dimension) and `variability` (a
+    VariabilityEngine) are optional.
+    """
+
+    def __init__(self, cube, metrics, aggregates=None, variability=None):
+        self.cube = cube
+        self.metrics = metrics
+        self.aggregates = aggregates
+        self.variability = variability
+
+        # Per-year country orders, highest first with missing values last;
+        # a top-k question is a slice of one column.
+        self._ranks = {
+            "change": self._rank_index(cube.values),
+            "yoy": self._rank_index(metrics.yoy),
+        }
+
+        names = {}
+        for country in cube.countries:
+            lower = country.lower()
+            names[lower] = country
+            names.setdefault(lower.split(",")[0].strip(), country)
+        for alias, country in COUNTRY_ALIASES.items():
+            if country in cube.country_index:
+                names[alias] = country
+        # Longest names first, so "south korea" wins over "korea"
+        self._names = sorted(names.items(), key=lambda kv: -len(kv[0]))
+        self._iso3 = {}
+        if "ISO3" in cube.long:
+            for country in cube.countries:
+                self._iso3[str(cube.frame(country)["ISO3"].iloc[0])] = country
+
+    def _rank_index(self, matrix):
+        real = np.flatnonzero(~self.cube.aggregate)
+        values = matrix[real]
+        key = np.where(np.isnan(values), np.inf, -values)
+        return real[np.argsort(key, axis=0, kind="stable")], (~np.isnan(values)).sum(axis=0), matrix
+
+    # ─── Parsing ──────────────────────────────────
+    def parse(self, prompt):
+        text = prompt.lower()
+
+        found, seen = [], set()
+        masked = " " + re.sub(r"[^a-z0-9,.()' -]", " ", text) + " "
+        for name, country in self._names:
+            pattern = rf"(?<![a-z]){re.escape(name)}(?![a-z])"
+            match = re.search(pattern, masked)
+            if match and country not in seen:
+                found.append((match.start(), country))
+                seen.add(country)
+                masked = re.sub(pattern, lambda m: " " * len(m.group()), masked)
+        # Bare ISO3 codes only count in mixed-case prompts: in an all-caps one
+        # every three-letter word would look like a code
+        codes = re.findall(r"\b[A-Z]{3}\b", prompt) if re.search(r"[a-z]", prompt) else []
+        for code in codes:
+            if code in self._iso3 and code not in ISO3_WORDS and self._iso3[code] not in seen:
+                found.append((prompt.find(code), self._iso3[code]))
+                seen.add(self._iso3[code])
+        countries = [c for _, c in sorted(found)]
+
+        years = [int(y) for y in re.findall(r"\b(1[89]\d\d|20\d\d)\b", text)]
+        k_match = re.search(r"\btop\s+(\d+)|\b(\d+)\s+(?:countries|nations)", text)
+        if k_match:
+            k = int(k_match.group(1) or k_match.group(2))
+        else:
+            k = 5 if re.search(r"\b(countries|nations)\b", text) else 1
+        k = max(1, min(k, 25))
+
+        high = re.search(rf"\b({HIGH_WORDS})\b", text)
+        low = re.search(rf"\b({LOW_WORDS})\b", text)
+        extreme = "low" if low else "high" if high else None
+        metric = "trend" if re.search(r"fastest|slowest|trend|warming rate|warm(?:ed|ing)? (?:the )?(?:most|least)", text) else "change"
+        # With two or more countries named, "which" picks among those, so the
+        # question is a comparison rather than a ranking of every country
+        asks_which = re.search(r"\bwhich\b|\bwhat countr|\btop\b|\brank", text) and len(countries) < 2
+
+        if "developed" in text and "developing" in text or re.search(r"\b(oecd|ldc|dev(?:elopment)? status)\b", text):
+            intent = "groups"
+        elif re.search(r"variab|stabl|stabil", text):
+            intent = "variability"
+        elif metric == "trend" and years and (asks_which or not countries):
+            intent = "yoy_rank"
+        elif metric == "trend" and (asks_which or not countries):
+            intent = "trend_rank"
+        elif years and (asks_which or not countries):
+            intent = "year_rank"
+        elif len(countries) >= 2:
+            intent = "compare"
+        elif countries:
+            intent = "country"
+        else:
+            intent = "help"
+        return Query(intent, countries, years, extreme or "high", k, metric)
+
+    # ─── Lookups ──────────────────────────────────
+    def top(self, year, k=1, lowest=False, by="change"):
+        """[(country, value)] for the k highest (or lowest) countries in a year.
+
+        `by` is "change" (temperature change) or "yoy" (change from the previous year).
+        """
+        order, valid, matrix = self._ranks[by]
+        j = self.cube.year_index[year]
+        order = order[:valid[j], j]
+        order = order[::-1][:k] if lowest else order[:k]
+        return [(self.cube.countries[i], float(matrix[i, j])) for i in order]
+
+    def value(self, country, year):
+        return float(self.cube.values[self.cube.country_index[country], self.cube.year_index[year]])
+
+    def latest(self, country):
+        """(year, value) of a country's most recent non-missing value, or (None, nan)."""
+        series = self.cube.values[self.cube.country_index[country]]
+        valid = np.flatnonzero(~np.isnan(series))
+        if not len(valid):
+            return None, float("nan")
+        return int(self.cube.years[valid[-1]]), float(series[valid[-1]])
+
+    def _check_years(self, years):
+        first, last = int(self.cube.years[0]), int(self.cube.years[-1])
+        bad = [y for y in years if y not in self.cube.year_index]
+        return f"I only have data for {first}–{last}." if bad else None
+
+    # ─── Answers ──────────────────────────────────
+    def answer(self, prompt):
+        q = self.parse(prompt)
+        if q.years and q.intent not in ("help", "variability", "trend_rank"):
+            problem = self._check_years(q.years)
+            if problem:
+                return problem
+        return getattr(self, f"_answer_{q.intent}")(q)
+
+    def _answer_year_rank(self, q):
+        year = q.years[0]
+        lowest = q.extreme == "low"
+        rows = self.top(year, q.k, lowest=lowest)
+        word = "lowest" if lowest else "highest"
+        if q.k == 1:
+            country, value = rows[0]
+            return f"In **{year}**, **{country}** had the {word} temperature change: **{_fmt(value)}** vs the 1951–1980 baseline."
+        lines = "\n".join(f"{i}. {c}: {_fmt(v)}" for i, (c, v) in enumerate(rows, 1))
+        return f"The {q.k} countries with the {word} temperature change in **{year}**:\n\n{lines}"
+
+    def _answer_yoy_rank(self, q):
+        year = q.years[0]
+        lowest = q.extreme == "low"
+        rows = self.top(year, q.k, lowest=lowest, by="yoy")
+        if not rows:
+            return f"There are no year-over-year changes for {year}."
+        word = "cooled the most" if lowest else "warmed the most"
+        lines = "\n".join(f"{i}. {c}: {_fmt(v)} vs {year - 1}" for i, (c, v) in enumerate(rows, 1))
+        if q.k == 1:
+            country, value = rows[0]
+            return f"**{country}** {word} in **{year}**: **{_fmt(value)}** compared with {year - 1}."
+        return f"The {q.k} countries that {word} in **{year}** (change from the previous year):\n\n{lines}"
+
+    def _answer_country(self, q):
+        country = q.countries[0]
+        i = self.cube.country_index[country]
+        if q.years:
+            parts = [f"**{y}**: {_fmt(self.value(country, y))}" for y in q.years]
+            if len(q.years) == 2 and not any(np.isnan(self.value(country, y)) for y in q.years):
+                delta = self.value(country, q.years[1]) - self.value(country, q.years[0])
+                parts.append(f"a difference of **{delta:+.2f} °C**")
+            return f"Temperature change in **{country}** — " + ", ".join(parts) + "."
+
+        last_year, last_value = self.latest(country)
+        if last_year is None:
+            return f"There are no temperature values for **{country}** in this dataset."
+        series = self.cube.values[i]
+        peak = int(np.nanargmax(series))
+        trend = self.metrics.slope[i] * 10
+        return (
+            f"**{country}**: {_fmt(last_value)} in {last_year} (latest). "
+            f"The warmest year on record was **{self.cube.years[peak]}** at {_fmt(series[peak])}. "
+            f"Long-run trend: **{trend:+.2f} °C per decade** over {self.metrics.coverage[i]} years of data."
+        )
+
+    def _answer_compare(self, q):
+        countries = q.countries[:5]
+        lowest = q.extreme == "low"
+        if q.years:
+            # Ranked among the named countries only, by the first year asked about
+            year = q.years[0]
+            ranked = sorted(countries, key=lambda c: (np.isnan(self.value(c, year)),
+                                                      self.value(c, year) if lowest else -self.value(c, year)))
+            lines = [f"- **{c}**: " + ", ".join(f"{y}: {_fmt(self.value(c, y))}" for y in q.years) for c in ranked]
+            lead = ranked[0]
+            if np.isnan(self.value(lead, year)):
+                return "Here's how they compare:\n\n" + "\n".join(lines)
+            word = "lowest" if lowest else "highest"
+            return (f"In **{year}**, **{lead}** had the {word} temperature change of these "
+                    f"({_fmt(self.value(lead, year))}):\n\n" + "\n".join(lines))
+
+        lines = []
+        for country in countries:
+            i = self.cube.country_index[country]
+            last_year, last_value = self.latest(country)
+            lines.append(f"- **{country}**: trend {self.metrics.slope[i] * 10:+.2f} °C/decade, "
+                         f"latest {_fmt(last_value)} ({last_year})")
+        return "Here's how they compare:\n\n" + "\n".join(lines)
+
+    def _answer_trend_rank(self, q):
+        k = q.k if q.k > 1 else 5
+        table = self.metrics.fastest_warming(len(self.cube.countries))
+        rows = table.iloc[::-1].head(k) if q.extreme == "low" else table.head(k)
+        word = "slowest" if q.extreme == "low" else "fastest"
+        lines = "\n".join(f"{i}. {r.Country}: {r.Trend:+.2f} °C/decade" for i, r in enumerate(rows.itertuples(), 1))
+        return f"The {word}-warming countries (linear trend, 30+ years of data):\n\n{lines}"
+
+    def _answer_groups(self, q):
+        if self.aggregates is None:
+            return HELP
+        yearly = self.aggregates.yearly("DevStatus")
+        lines = []
+        for group, rows in yearly.groupby("DevStatus", sort=True):
+            if q.years:
+                picked = rows[rows["Year"].isin(q.years)]
+                values = ", ".join(f"{int(r.Year)}: {_fmt(r.TempChange)}" for r in picked.itertuples())
+                lines.append(f"- **{group}**: {values or 'no data'}")
+            else:
+                slope = np.polyfit(rows["Year"], rows["TempChange"], 1)[0] * 10
+                recent = rows[rows["Year"] >= rows["Year"].max() - 9]["TempChange"].mean()
+                lines.append(f"- **{group}**: {recent:+.2f} °C average over the last decade, trend {slope:+.2f} °C/decade")
+        return "Average temperature change by development status:\n\n" + "\n".join(lines)
+
+    def _answer_variability(self, q):
+        text = (
+            "Variability refers to how much temperatures fluctuate year to year. "
+            "Less variability means more climate stability, which can affect ecosystems and planning."
+        )
+        if self.variability is None:
+            return text
+        split = q.years[0] if q.years and q.years[0] in self.cube.year_index else 1993
+        table = self.variability.split(split).dropna(subset=["Delta_Std"])
+        if q.countries:
+            rows = table[table["Country"].isin(q.countries)]
+            lines = "\n".join(f"- **{r.Country}**: std {r.Std_Early:.2f} → {r.Std_Late:.2f} °C ({r.Delta_Std:+.2f})"
+                              for r in rows.itertuples())
+            return f"{text}\n\nBefore vs from {split}:\n\n{lines}"
+        steadier = table[table["Delta_Std"] < 0].nsmallest(3, "Delta_Std")
+        names = ", ".join(f"{r.Country} ({r.Delta_Std:+.2f})" for r in steadier.itertuples())
+        return (
+            f"{text}\n\nSplitting at {split}, **{(table['Delta_Std'] < 0).sum()} of {len(table)}** countries became "
+            f"less variable. The biggest drops in standard deviation: {names}."
+        )
+
+    def _answer_help(self, q):
+        return "Great question! " + HELP
@@ -0,0 +1,243 @@
+# 🌍 CHART BUILDERS
+# Altair specs for the dashboard views. Each builder takes frames that have
+# already been through chart_data.reduce_for_chart and returns a chart, so the
+# same specs can be rendered by Streamlit or serialized by benchmark.py.
+import altair as alt
+import numpy as np
+import pandas as pd
+
+from climate_data import MonthlyCube
+
+GROUP_COLORS = {
+    "Developed": "#2ca02c", "OECD": "#2ca02c",
+    "Developing": "#ff7f0e", "LDC": "#ff7f0e",
+    "Other": "#7f7f7f",
+}
+
+MONTHS = MonthlyCube.MONTHS
+
+
+# ─── Explore Trends ───────────────────────────────
+def yoy_chart(yoy_data, scatter_data, selected_country):
+    """Year-over-year line stacked over the raw temperature change scatter."""
+    if selected_country == "All":
+        line = alt.Chart(yoy_data).mark_line(point=True).encode(
+            x=alt.X("Year:O"),
+            y=alt.Y("YoY_Change:Q", title="Change from Previous Year (°C)"),
+            color="Country:N",
+            tooltip=["Year", "Country", "YoY_Change"]
+        ).properties(title="Year-over-Year Change – Sample Countries", height=350, width=800)
+
+    else:
+        line = alt.Chart(yoy_data).mark_line(point=True).encode(
+            x=alt.X("Year:O"),
+            y=alt.Y("YoY_Change:Q", title="Change from Previous Year (°C)"),
+            color=alt.value("#f45b69"),
+            tooltip=["Year", "YoY_Change"]
+        ).properties(title=f"Year-over-Year Change – {selected_country}", height=350, width=800)
+
+    sel_country = alt.selection_point(fields=["Country"], empty="all")
+
+    scatter = alt.Chart(scatter_data).mark_circle(size=60).encode(
+        x=alt.X("Year:O", title="Year"),
+        y=alt.Y("TempChange:Q", title="Temperature Change (°C)"),
+        color=alt.Color("TempChange:Q", scale=alt.Scale(scheme="plasma")),
+        opacity=alt.condition(sel_country, alt.value(1), alt.value(0.15)),
+        tooltip=["Country", "Year", "TempChange"]
+    ).add_params(sel_country).properties(title="Raw Temperature Change", height=350, width=800)
+
+    return line & scatter
+
+
+def scatter_chart(scatter_data, selected_country):
+    sel_country = alt.selection_point(fields=["Country"], empty="all")
+
+    return alt.Chart(scatter_data).mark_circle(size=60).encode(
+        x=alt.X("Year:O", title="Year"),
+        y=alt.Y("TempChange:Q", title="Temperature Change (°C)"),
+        color=alt.Color("Country:N" if selected_country == "All" else "TempChange:Q",
+                        scale=alt.Scale(scheme="plasma")),
+        opacity=alt.condition(sel_country, alt.value(1), alt.value(0.15)),
+        tooltip=["Country", "Year", "TempChange"]
+    ).add_params(sel_country).properties(
+        width=800,
+        height=450,
+        title="Annual Temperature Change by Country"
+    )
+
+
+def variability_chart(decreasing, split_year, first_year, last_year):
+    return alt.Chart(decreasing).mark_bar().encode(
+        x=alt.X("Delta_Std:Q", title=f"∆ Std Dev ({split_year}–{last_year} − {first_year}–{split_year - 1})"),
+        y=alt.Y("Country:N", sort="-x"),
+        color=alt.Color("Delta_Std:Q", scale=alt.Scale(scheme="viridis", domainMid=0)),
+        tooltip=["Country", "Std_Early", "Std_Late", "Delta_Std"]
+    ).properties(
+        height=500,
+        width=750,
+        title="Top Countries with Decreasing Yearly Temperature Variability"
+    )
+
+
+def rolling_chart(rolling, window):
+    return alt.Chart(rolling).mark_line().encode(
+        x=alt.X("Year:O", title=f"End of {window}-Year Window"),
+        y=alt.Y("Rolling_Std:Q", title="Std Dev of Temp Change (°C)"),
+        color="Country:N",
+        tooltip=["Country", "Year", "Rolling_Std"]
+    ).properties(
+        height=400,
+        width=750,
+        title=f"Rolling {window}-Year Temperature Variability"
+    )
+
+
+def status_charts(dev_avg, dev_bar, group_dim, groups, bucket_width):
+    """(yearly line, bucketed bar) for one grouping; the legend filters both."""
+    if all(g in GROUP_COLORS for g in groups):
+        group_scale = alt.Scale(domain=groups, range=[GROUP_COLORS[g] for g in groups])
+    else:
+        # Groupings without fixed colors (Region) get one categorical color per group
+        group_scale = alt.Scale(domain=groups, scheme="tableau10")
+    dev_sel = alt.selection_multi(fields=[group_dim], bind="legend")
+
+    line_chart = alt.Chart(dev_avg).mark_line(point=True).encode(
+        x=alt.X("Year:O"),
+        y=alt.Y("TempChange:Q", title="Avg Temp Change (°C)"),
+        color=alt.Color(f"{group_dim}:N", scale=group_scale),
+        opacity=alt.condition(dev_sel, alt.value(1.0), alt.value(0.15)),
+        tooltip=["Year", group_dim, "TempChange", "Count"]
+    ).add_params(dev_sel).properties(
+        title="Average Temp Change by Economic Status",
+        width=750,
+        height=400
+    )
+
+    bar_chart = alt.Chart(dev_bar).mark_bar().encode(
+        x=alt.X("YearGroup:O", title=f"{bucket_width}-Year Group"),
+        y=alt.Y("TempChange:Q", title="Avg Temp Change (°C)"),
+        color=alt.Color(f"{group_dim}:N", scale=group_scale),
+        opacity=alt.condition(dev_sel, alt.value(1.0), alt.value(0.25)),
+        tooltip=["YearGroup", group_dim, "TempChange", "Count", "Variance"]
+    ).add_params(dev_sel).properties(
+        title=f"{bucket_width}-Year Avg Temp Change by Development Status",
+        width=750,
+        height=400
+    )
+
+    return line_chart, bar_chart
+
+
+# ─── Warming Gases ────────────────────────────────
+def gas_chart(gas_long):
+    # Interactive selection logic
+    selection = alt.selection_point(fields=['series'])
+    condition = alt.condition(selection, 'series:N', alt.ColorValue('lightgray'))
+
+    # Area chart showing contribution by gas
+    return alt.Chart(gas_long).mark_area(opacity=0.7).encode(
+        x=alt.X("Year:O", title="Year"),
+        y=alt.Y("Temp Change:Q", title="Temperature Change (°C)"),
+        color=condition,
+        order="series:N",
+        tooltip=['Year:O', 'Legend:N', 'Temp Change:Q']
+    ).add_params(selection).properties(
+        width=900,
+        height=500,
+        title="Warming Contributions by Gas Type and Emission Source"
+    )
+
+
+# ─── Monthly Explorer ─────────────────────────────
+def cycle_chart(cycles, entity):
+    return alt.Chart(cycles).mark_line(point=True).encode(
+        x=alt.X("Month:N", sort=MONTHS),
+        y=alt.Y("Temperature:Q", title="Average Temperature (°C)"),
+        color="Year:N",
+        tooltip=["Year", "Month", "Temperature"]
+    ).properties(title=f"Seasonal Cycle – {entity}", width=800, height=350)
+
+
+def climatology_frame(baseline, selected, year_range):
+    """Month-of-year means for the 1951–1980 baseline and the selected years, long form."""
+    return pd.DataFrame({
+        "Month": MONTHS * 2,
+        "Period": ["1951–1980"] * 12 + [f"{year_range[0]}–{year_range[1]}"] * 12,
+        "Temperature": np.r_[baseline, selected],
+    })
+
+
+def climatology_chart(climatology):
+    return alt.Chart(climatology).mark_bar().encode(
+        x=alt.X("Month:N", sort=MONTHS),
+        xOffset="Period:N",
+        y=alt.Y("Temperature:Q", title="Mean Temperature (°C)"),
+        color=alt.Color("Period:N", scale=alt.Scale(range=["#1f77b4", "#f45b69"])),
+        tooltip=["Period", "Month", "Temperature"]
+    ).properties(title="Month-of-Year Climatology", width=800, height=350)
+
+
+def anomaly_heatmap(heat, entity):
+    return alt.Chart(heat).mark_rect().encode(
+        x=alt.X("Year:O", title="Year"),
+        y=alt.Y("Month:N", sort=MONTHS),
+        color=alt.Color("Anomaly:Q", title="°C vs 1951–1980", scale=alt.Scale(scheme="redblue", reverse=True, domainMid=0)),
+        tooltip=["Year", "Month", "Anomaly"]
+    ).properties(title=f"Monthly Temperature Anomalies – {entity}", width=800, height=300)
+
+
+# ─── Contributions ────────────────────────────────
+def contribution_bar_chart(top, year):
+    return alt.Chart(top).mark_bar().encode(
+        x=alt.X("Share:Q", title="Share of Cumulative Warming (%)"),
+        y=alt.Y("Entity:N", sort=alt.EncodingSortField("Rank"), title=None),
+        color=alt.Color("Share:Q", scale=alt.Scale(scheme="reds"), legend=None),
+        tooltip=["Rank", "Entity", alt.Tooltip("Share:Q", format=".2f")]
+    ).properties(title=f"Largest Contributors to Global Warming – {year}", width=750, height=400)
+
+
+def rank_chart(ranks):
+    sel_entity = alt.selection_point(fields=["Entity"], bind="legend")
+
+    return alt.Chart(ranks).mark_line().encode(
+        x=alt.X("Year:O", title="Year"),
+        y=alt.Y("Rank:Q", title="Rank", scale=alt.Scale(reverse=True, zero=False)),
+        color="Entity:N",
+        opacity=alt.condition(sel_entity, alt.value(1), alt.value(0.15)),
+        tooltip=["Entity", "Year", "Rank"]
+    ).add_params(sel_entity).properties(title="Contribution Rank Over Time", width=800, height=400)
+
+
+def share_stack_chart(shares):
+    selection = alt.selection_point(fields=["Entity"], bind="legend")
+
+    return alt.Chart(shares).mark_area(opacity=0.8).encode(
+        x=alt.X("Year:O", title="Year"),
+        y=alt.Y("Share:Q", title="Share of Cumulative Warming (%)", stack="zero"),
+        color=alt.condition(selection, "Entity:N", alt.ColorValue("lightgray")),
+        tooltip=["Entity", "Year", alt.Tooltip("Share:Q", format=".2f")]
+    ).add_params(selection).properties(title="Share of Cumulative Warming Over Time", width=900, height=450)
+
+
+# ─── Food & Climate ───────────────────────────────
+def food_scatter_chart(pairs, label, country, lag):
+    """TempChange against the (lagged) food metric in column "Food", with a fitted line."""
+    when = "same year" if lag == 0 else f"{abs(lag)} year{'s' if abs(lag) > 1 else ''} {'later' if lag > 0 else 'earlier'}"
+    points = alt.Chart(pairs).mark_circle(size=70).encode(
+        x=alt.X("TempChange:Q", title="Temperature Change (°C)"),
+        y=alt.Y("Food:Q", title=f"{label} ({when})"),
+        color=alt.Color("Year:Q", scale=alt.Scale(scheme="viridis")),
+        tooltip=["Year", "TempChange", alt.Tooltip("Food:Q", title=label, format=",.3f")]
+    )
+    fit = points.transform_regression("TempChange", "Food").mark_line(color="#f45b69")
+    return (points + fit).properties(title=f"{country}: Temperature vs {label}", width=700, height=400)
+
+
+def lag_profile_chart(profile, lag):
+    return alt.Chart(profile).mark_bar().encode(
+        x=alt.X("Lag:O", title="Lag (years; positive = food figure later)"),
+        y=alt.Y("r:Q", title="Correlation (r)", scale=alt.Scale(domain=[-1, 1])),
+        color=alt.Color("r:Q", scale=alt.Scale(scheme="redblue", domain=[-1, 1]), legend=None),
+        opacity=alt.condition(alt.datum.Lag == lag, alt.value(1.0), alt.value(0.45)),
+        tooltip=["Lag", alt.Tooltip("r:Q", format=".3f"), "Years"]
+    ).properties(title="Correlation by Lag", width=700, height=250)
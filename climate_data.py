@@ -0,0 +1,1119 @@
+# 🌍 GLOBAL TEMPERATURE DATA LAYER
+# Loaders shared by the dashboard pages. Every CSV is parsed once into a typed,
+# column-per-file cache under .data_cache/ and memory-mapped on later starts.
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# ─── Sources ────────────────────────────────────
+DATA_DIR = Path(__file__).resolve().parent
+CACHE_DIR = DATA_DIR / ".data_cache"
+
+INDICATOR_CSV = "Indicator_3_1_Climate_Indicators_Annual_Mean_Global_Surface_Temperature_577579683071085080.csv"
+GAS_CSV = "global-warming-by-gas-and-source.csv"
+CONTRIBUTIONS_CSV = "contributions-global-temp-change.csv"
+MONTHLY_CSV = "monthly-average-surface-temperatures-by-year.csv"
+FOOD_CSV = "temp_change_df (1).csv"
+GROUPS_CSV = "country_groups.csv"
+
+CONTRIBUTION_COL = "Share of contribution to global warming"
+FOOD_VALUE_COL = "Food Gross Production Value (constant 2014-2016 thousand US$)"
+
+# Key columns are always stored as categoricals, whatever pandas inferred
+CATEGORICAL_COLS = ["Country", "ISO2", "ISO3", "Entity", "Code"]
+
+GAS_CACHE_SIZE = 64
+
+
+# ─── Columnar Cache ────────────────────────────────
+def file_hash(path):
+    """SHA-256 of a source file, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_meta(target):
+    """The meta.json of a published cache directory, or None if it has none (yet)."""
+    try:
+        with open(target / "meta.json", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def write_meta(target, meta):
+    """Write `meta` as target/meta.json, atomically."""
+    # A unique temp name: sessions are threads of one process
+    with tempfile.NamedTemporaryFile("w", dir=target, prefix="meta.json.", delete=False, encoding="utf-8") as fh:
+        json.dump(meta, fh)
+    os.replace(fh.name, target / "meta.json")
+
+
+def _is_fresh(meta, source, version, target):
+    # mtime + size is the cheap check; a touched-but-identical file is caught
+    # by the content hash and the cache is kept.
+    if meta is None or meta.get("version") != version:
+        return False
+    stat = source.stat()
+    if meta["mtime_ns"] == stat.st_mtime_ns and meta["size"] == stat.st_size:
+        return True
+    if meta["size"] != stat.st_size or meta["sha256"] != file_hash(source):
+        return False
+    meta.update(mtime_ns=stat.st_mtime_ns)
+    write_meta(target, meta)
+    return True
+
+
+# A superseded version younger than this may be another writer's, about to be linked
+VERSION_GRACE_SECONDS = 60
+
+
+def staging_dir(target):
+    """An empty private directory next to `target` to build it in, for publish()."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    return Path(tempfile.mkdtemp(dir=target.parent, prefix=f"{target.name}.tmp-"))
+
+
+def publish(tmp, target):
+    """Publish the staging directory `tmp` as `target`; returns the published version's directory.
+
+    `target` is a symlink to the current version directory, swapped with a
+    single os.replace: readers always find a complete version (write
+    meta.json last), never a missing one, and concurrent writers (threads or
+    replicas) each publish a whole version, the last one winning. Readers
+    resolve the link once (current_version), so one load never mixes files
+    of two versions. The version just superseded is kept for readers still
+    loading it; older ones are removed.
+    """
+    version = tmp.with_name(f"{target.name}.v-{tmp.name.rsplit('.tmp-', 1)[-1]}")
+    os.replace(tmp, version)
+    link = tmp.with_name(f"{target.name}.link-{version.name.rsplit('.v-', 1)[-1]}")
+    os.symlink(version.name, link)
+    previous = os.readlink(target) if target.is_symlink() else None
+    if target.is_dir() and not target.is_symlink():
+        # A cache published before versioned directories
+        legacy = tmp.with_name(f"{target.name}.old-{version.name.rsplit('.v-', 1)[-1]}")
+        try:
+            os.replace(target, legacy)
+        except FileNotFoundError:
+            pass
+        shutil.rmtree(legacy, ignore_errors=True)
+    os.replace(link, target)
+
+    now = time.time()
+    for old in target.parent.glob(f"{target.name}.v-*"):
+        if old.name not in (version.name, previous) and now - old.stat().st_mtime > VERSION_GRACE_SECONDS:
+            shutil.rmtree(old, ignore_errors=True)
+    return version
+
+
+def current_version(target):
+    """The version directory `target` points at now (target itself if none is published)."""
+    return target.resolve()
+
+
+def unpublish(target):
+    """Remove a published `target` and its version directories."""
+    if target.is_symlink():
+        target.unlink(missing_ok=True)
+    else:
+        shutil.rmtree(target, ignore_errors=True)
+    for old in target.parent.glob(f"{target.name}.v-*"):
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def is_published(path):
+    """True for a published target, False for version, staging and link entries beside it."""
+    return not any(mark in path.name for mark in (".v-", ".tmp-", ".link-", ".old-"))
+
+
+def _source_meta(source, version):
+    stat = source.stat()
+    return {
+        "source": source.name,
+        "version": version,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": file_hash(source),
+        "header": list(pd.read_csv(source, nrows=0).columns),
+    }
+
+
+def _appended_years(meta, source, version):
+    """Year columns a wide source gained since it was cached, or None if it changed otherwise.
+
+    Existing columns must all still be there and new ones must be later
+    years. Whether their values are unchanged is for the extend function to
+    check: it returns None, forcing a full build, when a past year was revised.
+    """
+    if meta is None or meta.get("version") != version or "header" not in meta:
+        return None
+    old = set(meta["header"])
+    header = list(pd.read_csv(source, nrows=0).columns)
+    added = [c for c in header if c not in old]
+    if len(header) - len(added) != len(old) or not all(c.isdigit() for c in added):
+        return None
+    last = max((int(c) for c in old if c.isdigit()), default=None)
+    if last is None or any(int(c) <= last for c in added):
+        return None
+    return sorted(added, key=int)
+
+
+def _write_table(df, target, meta):
+    tmp = staging_dir(target)
+    columns = []
+    for i, name in enumerate(df.columns):
+        col = df[name]
+        if name in CATEGORICAL_COLS or pd.api.types.is_string_dtype(col.dtype):
+            col = col.astype("category")
+        entry = {"name": name, "file": f"c{i}.npy"}
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            entry["categories"] = [str(c) for c in col.cat.categories]
+            np.save(tmp / entry["file"], col.cat.codes.to_numpy())
+        else:
+            np.save(tmp / entry["file"], col.to_numpy())
+        columns.append(entry)
+
+    meta = dict(meta, columns=columns, rows=len(df))
+    write_meta(tmp, meta)
+    return publish(tmp, target), meta
+
+
+def _read_table(target, meta):
+    data = {}
+    for entry in meta["columns"]:
+        values = np.load(target / entry["file"], mmap_mode="r")
+        if "categories" in entry:
+            data[entry["name"]] = pd.Categorical.from_codes(values, entry["categories"])
+        else:
+            data[entry["name"]] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def cached_table(name, source, build, version=1, extend=None):
+    """Return build(source) as a DataFrame, served from the columnar cache.
+
+    The cache is rebuilt when the source changes (mtime/size, then SHA-256)
+    or when the caller bumps `version` because `build` changed. With
+    `extend(source, cached, added_years)`, a wide source that only gained
+    year columns is merged into the cached table instead; extend returns
+    None to fall back to a full build.
+    """
+    source = DATA_DIR / source
+    target = CACHE_DIR / name
+    current = current_version(target)
+    meta = read_meta(current)
+    if _is_fresh(meta, source, version, current):
+        return _read_table(current, meta)
+
+    df, extends = None, None
+    added = _appended_years(meta, source, version) if extend is not None else None
+    if added is not None:
+        df = extend(source, _read_table(current, meta), added)
+        extends = meta["sha256"]
+    if df is None:
+        df, extends = build(source), None
+    current, meta = _write_table(df.reset_index(drop=True), target,
+                                 dict(_source_meta(source, version), extends=extends))
+    return _read_table(current, meta)
+
+
+def cached_arrays(name, source, build, version=1, extend=None):
+    """Like cached_table, for build(source) -> (dict of ndarrays, JSON-able info).
+
+    Returns the arrays memory-mapped read-only, plus the info dict. `extend`
+    is called as extend(source, arrays, info, added_years).
+    """
+    source = DATA_DIR / source
+    target = CACHE_DIR / name
+    current = current_version(target)
+    meta = read_meta(current)
+    if not _is_fresh(meta, source, version, current):
+        built, extends = None, None
+        added = _appended_years(meta, source, version) if extend is not None else None
+        if added is not None:
+            cached = {key: np.load(current / f"{key}.npy", mmap_mode="r") for key in meta["arrays"]}
+            built = extend(source, cached, meta["info"], added)
+            extends = meta["sha256"]
+        arrays, info = built or build(source)
+        extends = extends if built else None
+        tmp = staging_dir(target)
+        for key, values in arrays.items():
+            np.save(tmp / f"{key}.npy", values)
+        meta = dict(_source_meta(source, version), arrays=list(arrays), info=info, extends=extends)
+        write_meta(tmp, meta)
+        current = publish(tmp, target)
+    arrays = {key: np.load(current / f"{key}.npy", mmap_mode="r") for key in meta["arrays"]}
+    return arrays, meta["info"]
+
+
+def source_version(name):
+    """Content hash of the source behind a cached table, plus its cache version ('' if not cached yet)."""
+    meta = read_meta(CACHE_DIR / name)
+    return f"{meta['sha256'][:12]}.{meta['version']}" if meta else ""
+
+
+def extended_from(name):
+    """Source version a cache was extended from by appended years, or None if built in full."""
+    meta = read_meta(CACHE_DIR / name)
+    # Only a cache of the same version is ever extended
+    return f"{meta['extends'][:12]}.{meta['version']}" if meta and meta.get("extends") else None
+
+
+def source_stamp(*names):
+    """(mtime, size) of the sources behind `names` (default: every startup cache).
+
+    A few stat calls, cheap enough to check on every rerun: cached loaders
+    keyed on it reload once a source file is replaced or appended to.
+    """
+    stamp = []
+    for name in names or STARTUP_CACHES:
+        stat = (DATA_DIR / CACHES[name][1]).stat()
+        stamp.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(stamp)
+
+
+# ─── Shared Arrays ────────────────────────────────
+SHARED_DIR = CACHE_DIR / "shared"
+
+
+def shared_arrays(handle, build):
+    """Arrays for a dataset version, published once as .npy files and memory-mapped read-only.
+
+    The first process to ask runs build() -> {name: ndarray} and publishes
+    the result under .data_cache/shared/; every other session and server
+    process on the host maps the same pages, so resident memory stays flat
+    as sessions and replicas grow. Older versions of the same dataset are
+    removed (processes still mapping them keep their pages).
+    """
+    target = SHARED_DIR / f"{handle.name}@{handle.version}"
+    current = current_version(target)
+    meta = read_meta(current)
+    if meta is None:
+        arrays = build()
+        tmp = staging_dir(target)
+        for key, values in arrays.items():
+            np.save(tmp / f"{key}.npy", values)
+        meta = {"arrays": list(arrays)}
+        write_meta(tmp, meta)
+        current = publish(tmp, target)
+        for old in SHARED_DIR.glob(f"{handle.name}@*"):
+            # Leave other writers' staging and version directories alone
+            if old != target and is_published(old):
+                unpublish(old)
+    return {key: np.load(current / f"{key}.npy", mmap_mode="r") for key in meta["arrays"]}
+
+
+def published_arrays(handle):
+    """Arrays already published for a dataset version, memory-mapped, or None."""
+    current = current_version(SHARED_DIR / f"{handle.name}@{handle.version}")
+    meta = read_meta(current)
+    if meta is None:
+        return None
+    return {key: np.load(current / f"{key}.npy", mmap_mode="r") for key in meta["arrays"]}
+
+
+def share(handle, build):
+    """shared_arrays() when a handle is given, else build() in-process."""
+    return build() if handle is None else shared_arrays(handle, build)
+
+
+def versioned(handle, build):
+    """`handle` for the arrays of one particular build, or None without a handle.
+
+    `build` names the code and arguments that produce the arrays (a class's
+    BUILD_VERSION, plus any parameters), so arrays published by an older
+    build or with other arguments are never served.
+    """
+    return None if handle is None else handle._replace(version=f"{handle.version}~{build}")
+
+
+# ─── Dataset Handles ──────────────────────────────
+# A handle is a tiny hashable token standing in for a loaded dataset, so cached
+# compute functions key on (handle, filters) instead of hashing whole frames.
+# The version is the source content hash: new data means new handles and
+# therefore fresh cache entries.
+DatasetHandle = namedtuple("DatasetHandle", ["name", "version"])
+
+# The previous version stays resolvable after a refresh, so sessions midway
+# through a rerun on it finish undisturbed; their next rerun gets the new one.
+DATASET_VERSIONS_KEPT = 2
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def register_dataset(name, dataset, version):
+    """Publish `dataset` process-wide and return its handle. Versions beyond the last two are dropped."""
+    handle = DatasetHandle(name, version)
+    with _registry_lock:
+        _registry.pop(handle, None)
+        _registry[handle] = dataset
+        for old in [h for h in _registry if h.name == name][:-DATASET_VERSIONS_KEPT]:
+            del _registry[old]
+    return handle
+
+
+def clear_datasets():
+    """Forget every registered dataset, as a fresh server process would start."""
+    with _registry_lock:
+        _registry.clear()
+
+
+def latest(name):
+    """The most recently registered handle for `name`, or None."""
+    with _registry_lock:
+        handles = [h for h in _registry if h.name == name]
+    return handles[-1] if handles else None
+
+
+def resolve(handle):
+    """The dataset behind a handle. Raises KeyError for unknown or superseded handles."""
+    return _registry[handle]
+
+
+# ─── Source Schemas ───────────────────────────────
+# Each CSV is declared once: its layout ("wide" = one column per year),
+# the columns it must have with their pinned dtypes, the dtype of its year
+# columns, the dtype of any other column kept (None drops them), which
+# column carries the country key, and a leftover index column if any.
+SourceSchema = namedtuple("SourceSchema", ["layout", "columns", "values", "extra", "key", "index_col"])
+
+_TEXT = "str"
+SCHEMAS = {
+    "indicator": SourceSchema(
+        "wide", {"Country": _TEXT, "ISO2": _TEXT, "ISO3": _TEXT, "Indicator": _TEXT, "Unit": _TEXT},
+        "float64", None, "ISO3", None),
+    "monthly": SourceSchema(
+        # Rows are (Entity, month); the "Year" column holds the month number
+        "wide", {"Entity": _TEXT, "Code": _TEXT, "Year": "int8"}, "float32", None, "Code", None),
+    "gas": SourceSchema(
+        "long", {"Entity": _TEXT, "Code": _TEXT, "Year": "int32"}, None, "float64", "Code", None),
+    "contributions": SourceSchema(
+        "long", {"Entity": _TEXT, "Code": _TEXT, "Year": "int32", CONTRIBUTION_COL: "float64"},
+        None, None, "Code", None),
+    "food": SourceSchema(
+        "long", {"Entity": _TEXT, "Code": _TEXT, "Country": _TEXT, "ISO3": _TEXT, "Year": "int32",
+                 FOOD_VALUE_COL: "float64", "TempChange": "float64", "Growth Rate": "float64",
+                 "OECD_LDC": _TEXT, "DevStaus": _TEXT},
+        None, _TEXT, "ISO3", 0),
+    "country_groups": SourceSchema(
+        "long", {"ISO3": _TEXT, "DevStatus": _TEXT, "OECD_LDC": _TEXT, "Region": _TEXT, "IsAggregate": "int8"},
+        None, None, "ISO3", None),
+}
+
+# OWID-style sources key countries by ISO3 too, except for these entities
+OWID_TO_ISO3 = {"OWID_WRL": "WLD", "OWID_KOS": "XKX"}
+
+SOURCE_CHUNK_ROWS = 50_000
+
+
+def read_source(name, path, chunksize=SOURCE_CHUNK_ROWS):
+    """Parse `path` against SCHEMAS[name] in dtype-pinned chunks.
+
+    Raises ValueError naming the file when a declared column is missing or a
+    value does not parse as its declared dtype. The result always has an
+    ISO3 column: OWID `Code`s are mapped through OWID_TO_ISO3, so every
+    table joins on the same country key.
+    """
+    schema = SCHEMAS[name]
+    header = pd.read_csv(path, nrows=0).columns
+    if schema.index_col is not None:
+        header = header.delete(schema.index_col)
+    missing = [c for c in schema.columns if c not in header]
+    if missing:
+        raise ValueError(f"{Path(path).name}: missing columns {missing}")
+    years = [c for c in header if c.isdigit()] if schema.layout == "wide" else []
+    if schema.layout == "wide" and not years:
+        raise ValueError(f"{Path(path).name}: no year columns")
+
+    dtypes = dict(schema.columns, **dict.fromkeys(years, schema.values))
+    if schema.extra is not None:
+        dtypes = dict(dict.fromkeys(header, schema.extra), **dtypes)
+    usecols = None if schema.extra is not None else lambda c: c in dtypes
+    try:
+        chunks = pd.read_csv(path, dtype=dtypes, usecols=usecols, index_col=schema.index_col, chunksize=chunksize)
+        df = pd.concat(list(chunks))
+    except ValueError as err:
+        raise ValueError(f"{Path(path).name}: {err}") from err
+
+    if schema.key != "ISO3":
+        df["ISO3"] = df[schema.key].replace(OWID_TO_ISO3)
+    return df
+
+
+# ─── Loaders ───────────────────────────────────────
+def _build_indicator(path):
+    return _melt_indicator(read_source("indicator", path))
+
+
+def _melt_indicator(df):
+    year_cols = [c for c in df.columns if c.isdigit()]
+    df_long = df.melt(
+        id_vars=["Country", "ISO2", "ISO3", "Indicator", "Unit"],
+        value_vars=year_cols,
+        var_name="Year",
+        value_name="TempChange"
+    )
+    df_long["Year"] = df_long["Year"].astype(int)
+    df_long.sort_values(["Country", "Year"], inplace=True)
+    return df_long
+
+
+def _extend_indicator(path, cached, added):
+    """The cached long table plus the `added` year columns, or None to rebuild.
+
+    The whole file is parsed, but only the new columns are melted. The
+    country rows and every cached year must match the cache exactly, so a
+    release that also revises past values is rebuilt in full.
+    """
+    if not added:
+        return None
+    df = read_source("indicator", path)
+    years = np.unique(cached["Year"].to_numpy())
+    if df["Country"].duplicated().any() or len(cached) % len(years):
+        return None
+    # The cache is sorted by (Country, Year) over a full grid: one row per country every len(years)
+    rows = cached.iloc[::len(years)]
+    countries = rows["Country"].astype(str).to_numpy()
+    if set(df["Country"]) != set(countries):
+        return None
+    df = df.set_index("Country").loc[countries].reset_index()
+    for name in ["ISO2", "ISO3", "Indicator", "Unit"]:
+        if not (rows[name].astype(object).fillna("").to_numpy() == df[name].astype(object).fillna("").to_numpy()).all():
+            return None
+    past = df[[str(y) for y in years]].to_numpy(dtype=np.float64)
+    if not np.array_equal(past, cached["TempChange"].to_numpy().reshape(len(countries), len(years)), equal_nan=True):
+        return None
+
+    appended = _melt_indicator(df.drop(columns=[str(y) for y in years]))
+    # Cached text columns are categoricals; merging codes avoids rebuilding strings
+    merged = {}
+    for name in cached.columns:
+        if isinstance(cached[name].dtype, pd.CategoricalDtype):
+            merged[name] = union_categoricals([cached[name], appended[name].astype("category")],
+                                              sort_categories=True)
+        else:
+            merged[name] = np.concatenate([cached[name].to_numpy(), appended[name].to_numpy()])
+    return pd.DataFrame(merged).sort_values(["Country", "Year"], kind="stable")
+
+
+def load_indicator():
+    """Annual temperature change per country, long form (Country, Year, TempChange, ...).
+
+    Country groupings from country_groups.csv (DevStatus, OECD_LDC, Region,
+    IsAggregate) are joined on at load time.
+    """
+    return classify(_cached("indicator"))
+
+
+def load_country_groups():
+    return _cached("country_groups")
+
+
+def classify(df, groups=None, key="ISO3"):
+    """Join every grouping column of `groups` onto df by `key`, in one vectorized pass.
+
+    The group table is aligned to the categories of df[key] once, then each
+    grouping is a single take on the category codes. Codes missing from the
+    table get NaN groupings and IsAggregate=False.
+    """
+    groups = load_country_groups() if groups is None else groups
+    keys = df[key] if isinstance(df[key].dtype, pd.CategoricalDtype) else df[key].astype("category")
+    groups = groups.drop_duplicates(key)
+    table = groups.set_index(groups[key].astype(str)).drop(columns=key).reindex(keys.cat.categories.astype(str))
+    codes = keys.cat.codes.to_numpy()
+
+    columns = {}
+    for name in table.columns:
+        if name == "IsAggregate":
+            lookup = table[name].fillna(0).to_numpy(dtype=bool)
+            columns[name] = np.append(lookup, False)[codes]
+        else:
+            lookup = table[name].astype("category")
+            group_codes = np.append(lookup.cat.codes.to_numpy(), -1)[codes]
+            columns[name] = pd.Categorical.from_codes(group_codes, lookup.cat.categories)
+    return df.assign(**columns)
+
+
+def is_aggregate(iso3):
+    """Boolean mask of the regional/world aggregate codes among `iso3` (IsAggregate in the group table)."""
+    groups = load_country_groups()[["ISO3", "IsAggregate"]]
+    return classify(pd.DataFrame({"ISO3": iso3}), groups)["IsAggregate"].to_numpy()
+
+
+def load_gas_raw():
+    return _cached("gas")
+
+
+def load_contributions_raw():
+    return _cached("contributions")
+
+
+def load_monthly_raw():
+    return _cached("monthly")
+
+
+def load_food_raw():
+    # The merged export's leftover index column is dropped by its schema
+    return _cached("food")
+
+
+# ─── Grouped Blocks ───────────────────────────────
+def _group_blocks(keys):
+    """(labels, starts, stops) of the contiguous runs in `keys`, or None if a key repeats."""
+    codes = keys.cat.codes.to_numpy() if isinstance(keys.dtype, pd.CategoricalDtype) else pd.factorize(keys)[0]
+    breaks = np.flatnonzero(np.diff(codes)) + 1
+    starts = np.r_[0, breaks]
+    if len(np.unique(codes[starts])) != len(starts):
+        return None
+    stops = np.r_[breaks, len(codes)]
+    return keys.iloc[starts].astype(str).to_numpy(), starts, stops
+
+
+def _ascending_within(values, starts):
+    """True if `values` strictly increases inside every block."""
+    step = np.diff(values) > 0
+    step[starts[1:] - 1] = True
+    return bool(step.all())
+
+
+# ─── Dataset Lookups ──────────────────────────────
+class YearAxis:
+    """Mixin for datasets with a sorted `years` array along their year axis."""
+
+    def year_slice(self, start=None, stop=None):
+        """Index slice of `years` for the inclusive year range [start, stop]."""
+        lo = 0 if start is None else int(np.searchsorted(self.years, start, side="left"))
+        hi = len(self.years) if stop is None else int(np.searchsorted(self.years, stop, side="right"))
+        return slice(lo, hi)
+
+
+class EntityLookup:
+    """Mixin resolving dashboard countries to a dataset's own row labels.
+
+    Datasets set `entity_index` (label -> row) and `code_index` (ISO3 ->
+    label); WORLD is the label shown for "All", or None without a world row.
+    """
+
+    WORLD = "World"
+
+    def entity_for(self, country, iso3=None):
+        """This dataset's label for a dashboard country, or None if it has no row for it."""
+        if country == "All":
+            return self.WORLD
+        if iso3 in self.code_index:
+            return self.code_index[iso3]
+        return country if country in self.entity_index else None
+
+
+# ─── Country × Year Cube ──────────────────────────
+class TempCube(YearAxis):
+    """Dense Country×Year matrix over a long table sorted by (Country, Year).
+
+    `values` holds one float32 row per country and one column per year.
+    Country and year lookups are dict hits, and row/year-range slices are
+    numpy views, so sidebar switches never rescan the long frame.
+
+    `base` is the cube of the previous release when this one only appends
+    years to it: the matrix then starts as a copy of base's and only the
+    new years are scattered in. `extends` records (base handle, base year
+    count) so derived arrays can be extended the same way.
+    """
+
+    # Bump when build() changes: shared matrices are keyed on it
+    BUILD_VERSION = 1
+
+    def __init__(self, df_long, key="Country", value="TempChange", shared_as=None, base=None):
+        blocks = _group_blocks(df_long[key])
+        if blocks is None:
+            raise ValueError(f"TempCube needs rows grouped by {key!r}; sort the frame first")
+        self.countries, starts, stops = blocks
+
+        self.long = df_long
+        self.key = key
+        self.country_index = {c: i for i, c in enumerate(self.countries)}
+        # Regional/world aggregate rows, flagged by classify()
+        if "IsAggregate" in df_long:
+            self.aggregate = df_long["IsAggregate"].to_numpy()[starts]
+        else:
+            self.aggregate = np.zeros(len(starts), dtype=bool)
+        # ISO3 per country: the key every other dataset is matched on
+        codes = df_long["ISO3"].iloc[starts] if "ISO3" in df_long else []
+        self.iso3 = {c: str(code) for c, code in zip(self.countries, codes) if pd.notna(code)}
+        self._blocks = list(zip(starts.tolist(), stops.tolist()))
+
+        year = df_long["Year"].to_numpy()
+        self.years = np.arange(year.min(), year.max() + 1)
+        self.year_index = {int(y): j for j, y in enumerate(self.years)}
+
+        if (base is not None and base.shared_as is not None and np.array_equal(base.countries, self.countries)
+                and base.years[0] == self.years[0] and len(base.years) < len(self.years)):
+            self.extends = (base.shared_as, len(base.years))
+        else:
+            self.extends = None
+
+        def build():
+            values = np.full((len(self.countries), len(self.years)), np.nan, dtype=np.float32)
+            rows = np.repeat(np.arange(len(starts)), stops - starts)
+            cols = year - self.years[0]
+            x = df_long[value].to_numpy()
+            if self.extends is not None:
+                done = self.extends[1]
+                values[:, :done] = base.values
+                new = cols >= done
+                rows, cols, x = rows[new], cols[new], x[new]
+            values[rows, cols] = x
+            return {"values": values}
+
+        # With a handle, the matrix is published once per host and memory-mapped
+        self.shared_as = shared_as
+        self.values = share(versioned(shared_as, self.BUILD_VERSION), build)["values"]
+        self.values.flags.writeable = False
+
+    def between(self, start=None, stop=None):
+        """All countries over an inclusive year range, as a view."""
+        return self.values[:, self.year_slice(start, stop)]
+
+    def series(self, country, start=None, stop=None):
+        """One country's values over an inclusive year range, as a view."""
+        return self.values[self.country_index[country], self.year_slice(start, stop)]
+
+    def frame(self, countries):
+        """Long-form rows for one country (a slice) or several (concatenated slices)."""
+        if isinstance(countries, str):
+            start, stop = self._blocks[self.country_index[countries]]
+            return self.long.iloc[start:stop]
+        parts = [self.long.iloc[slice(*self._blocks[self.country_index[c]])] for c in countries]
+        return pd.concat(parts) if parts else self.long.iloc[:0]
+
+
+def load_indicator_cube():
+    """Load the indicator table as a TempCube and register it; returns its handle.
+
+    The handle version combines the indicator and country-group source
+    hashes, and the cube's derived arrays are shared under that version.
+    When the cache was extended by appended years from the release now
+    registered, the new cube (and its derived arrays) extend that one.
+    """
+    df_long = load_indicator()
+    groups = source_version("country_groups")
+    version = f"{source_version('indicator')}-{groups}"
+    previous = latest("indicator")
+    if previous is not None and previous.version == version:
+        return previous
+    base = None
+    if previous is not None and previous.version == f"{extended_from('indicator')}-{groups}":
+        base = resolve(previous)
+    cube = TempCube(df_long, shared_as=DatasetHandle("indicator", version), base=base)
+    return register_dataset("indicator", cube, version)
+
+
+# ─── Warming Gases ────────────────────────────────
+GAS_NAMES = {"nitrous oxide": "N2O", "methane": "CH4", "CO₂": "CO2"}
+
+GAS_LABELS = {
+    "CO2_FF&I": "CO₂ (Fossil Fuels & Industry)",
+    "CO2_AgLU": "CO₂ (Agriculture & Land Use)",
+    "CH4_FF&I": "CH₄ (Fossil Fuels & Industry)",
+    "CH4_AgLU": "CH₄ (Agriculture & Land Use)",
+    "N2O_FF&I": "N₂O (Fossil Fuels & Industry)",
+    "N2O_AgLU": "N₂O (Agriculture & Land Use)"
+}
+
+
+def gas_series_name(col):
+    """Short series code ("CH4_AgLU", ...) for a "Change in ... caused by ..." column."""
+    gas = next((code for name, code in GAS_NAMES.items() if name in col), "CO2")
+    source = "FF&I" if "fossil fuels" in col else "AgLU"
+    return f"{gas}_{source}"
+
+
+class GasSeries(EntityLookup):
+    """Warming contribution by gas and source, indexed by Entity.
+
+    The six "Change in ..." columns are resolved to series codes once, and each
+    entity's rows are a contiguous block, so a (entity, year range) request is
+    a slice. Long-form results are kept in a bounded LRU cache; callers must
+    not mutate them.
+    """
+
+    # Bump when the shared values matrix changes
+    BUILD_VERSION = 1
+
+    def __init__(self, df, shared_as=None):
+        blocks = _group_blocks(df["Entity"])
+        if blocks is None or not _ascending_within(df["Year"].to_numpy(), blocks[1]):
+            df = df.sort_values(["Entity", "Year"], kind="stable").reset_index(drop=True)
+            blocks = _group_blocks(df["Entity"])
+        self.entities, starts, stops = blocks
+        self.entity_index = {e: i for i, e in enumerate(self.entities)}
+        self._blocks = list(zip(starts.tolist(), stops.tolist()))
+
+        codes = df["ISO3"].iloc[starts]
+        # Regions and income groups have no code
+        coded = codes.notna().to_numpy()
+        self.code_index = dict(zip(codes[coded].astype(str), self.entities[coded]))
+
+        gas_cols = [c for c in df.columns if c.startswith("Change in")]
+        self.series = np.array([gas_series_name(c) for c in gas_cols])
+        self.legend = np.array([GAS_LABELS[s] for s in self.series])
+        self.year = df["Year"].to_numpy()
+        self.values = share(versioned(shared_as, self.BUILD_VERSION),
+                            lambda: {"values": df[gas_cols].to_numpy(dtype=np.float64)})["values"]
+        self.long = functools.lru_cache(maxsize=GAS_CACHE_SIZE)(self._long)
+
+    def _long(self, entity, year_range):
+        start, stop = self._blocks[self.entity_index[entity]]
+        years = self.year[start:stop]
+        lo = start + int(np.searchsorted(years, year_range[0], side="left"))
+        hi = start + int(np.searchsorted(years, year_range[1], side="right"))
+
+        n = hi - lo
+        return pd.DataFrame({
+            "Year": np.tile(self.year[lo:hi], len(self.series)),
+            "series": np.repeat(self.series, n),
+            "Temp Change": self.values[lo:hi].T.ravel(),
+            "Legend": np.repeat(self.legend, n),
+        })
+
+
+def load_gas():
+    raw = load_gas_raw()
+    return GasSeries(raw, shared_as=DatasetHandle("gas", source_version("gas")))
+
+
+# ─── Monthly Temperatures ─────────────────────────
+def _build_monthly(path):
+    df = read_source("monthly", path).sort_values(["Entity", "Year"], kind="stable")
+    # Year columns arrive newest-first with a few out of order; the cube is sorted
+    year_cols = sorted((c for c in df.columns if c.isdigit()), key=int)
+    entities = df["Entity"].drop_duplicates()
+    codes = df.groupby("Entity", sort=False)["ISO3"].first().reindex(entities)
+
+    values = np.full((len(entities), 12, len(year_cols)), np.nan, dtype=np.float32)
+    rows = pd.Categorical(df["Entity"], categories=entities).codes
+    values[rows, df["Year"].to_numpy() - 1] = df[year_cols].to_numpy(dtype=np.float32)
+    return {"values": values}, {
+        "entities": entities.tolist(),
+        "codes": [c if isinstance(c, str) else "" for c in codes],
+        "years": [int(y) for y in year_cols],
+    }
+
+
+class MonthlyCube(EntityLookup, YearAxis):
+    """Monthly mean surface temperature as a read-only (entity, month, year) float32 array.
+
+    The array is memory-mapped from .data_cache/, so every session and
+    process shares the same pages. Seasonal cycles, climatologies and
+    heatmaps are slices and reductions of it, never a melt or filter.
+    """
+
+    MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+    def __init__(self, values, entities, codes, years):
+        self.values = values
+        self.entities = list(entities)
+        self.entity_index = {e: i for i, e in enumerate(self.entities)}
+        self.code_index = {c: e for c, e in zip(codes, self.entities) if c}
+        self.years = np.asarray(years)
+
+    def grid(self, entity, start=None, stop=None):
+        """Month × year block for one entity, as a view."""
+        return self.values[self.entity_index[entity], :, self.year_slice(start, stop)]
+
+    def climatology(self, entity, start=None, stop=None):
+        """Mean temperature for each month of the year over [start, stop]."""
+        with np.errstate(invalid="ignore"):
+            return np.nanmean(self.grid(entity, start, stop), axis=1)
+
+    def anomalies(self, entity, baseline=(1951, 1980), start=None, stop=None):
+        """Month × year departures from the baseline month-of-year climatology."""
+        clim = self.climatology(entity, *baseline)
+        return self.grid(entity, start, stop) - clim[:, None]
+
+    def month_frame(self, grid, years, value):
+        """Long (Month, Year, value) rows for a month × year grid, for charts."""
+        return pd.DataFrame({
+            "Month": np.repeat(self.MONTHS, len(years)),
+            "Year": np.tile(years, 12),
+            # float32 storage; three decimals keeps tooltips free of widening noise
+            value: np.round(np.asarray(grid, dtype=np.float64).ravel(), 3),
+        })
+
+
+def load_monthly():
+    arrays, info = _cached("monthly_cube")
+    return MonthlyCube(arrays["values"], info["entities"], info["codes"], info["years"])
+
+
+# ─── Warming Contributions ────────────────────────
+
+def _build_contributions(path):
+    df = read_source("contributions", path).sort_values(["Entity", "Year"], kind="stable")
+    entities = df["Entity"].drop_duplicates()
+    codes = df.groupby("Entity", sort=False)["ISO3"].first().reindex(entities)
+    codes = np.array([c if isinstance(c, str) else "" for c in codes], dtype=object)
+    years = np.arange(df["Year"].min(), df["Year"].max() + 1)
+
+    values = np.full((len(entities), len(years)), np.nan, dtype=np.float64)
+    rows = pd.Categorical(df["Entity"], categories=entities).codes
+    values[rows, df["Year"].to_numpy() - years[0]] = df[CONTRIBUTION_COL].to_numpy(dtype=np.float64)
+
+    # Only coded entities other than World are ranked; regions, income groups
+    # and one-off sources (no code) would otherwise crowd the top ranks.
+    ranked = (codes != "") & (codes != "WLD")
+    key = np.where(ranked[:, None] & ~np.isnan(values), values, -np.inf)
+    order = np.argsort(-key, axis=0, kind="stable").T[:, :ranked.sum()]
+    valid = np.take_along_axis(key.T, order, axis=1) > -np.inf
+    order = np.where(valid, order, -1).astype(np.int32)
+
+    ranks = np.zeros(values.shape, dtype=np.int32)
+    year_cols = np.broadcast_to(np.arange(len(years))[:, None], order.shape)
+    ranks[order[valid], year_cols[valid]] = np.broadcast_to(np.arange(1, order.shape[1] + 1), order.shape)[valid]
+    return {"values": values, "order": order, "ranks": ranks}, {
+        "entities": entities.tolist(),
+        "codes": codes.tolist(),
+        "years": [int(years[0]), int(years[-1])],
+    }
+
+
+class ContributionCube(EntityLookup, YearAxis):
+    """Each entity's share of cumulative global warming per year, with per-year ranks.
+
+    `values` holds one row per entity (its cumulative-share series).
+    `order[y]` lists the ranked entity rows for year column y, largest share
+    first, padded with -1. `ranks[e, y]` is the 1-based rank, or 0 where an
+    entity is unranked. Everything is built once into .data_cache/, so top-N,
+    rank trajectories and share stacks are slices and never sort per request.
+    """
+
+    def __init__(self, values, order, ranks, entities, codes, years):
+        self.values = values
+        self.order = order
+        self.ranks = ranks
+        self.ranked = ranks.any(axis=1)
+        self.entities = np.asarray(entities, dtype=object)
+        self.entity_index = {e: i for i, e in enumerate(self.entities)}
+        self.codes = list(codes)
+        self.code_index = {c: e for c, e in zip(self.codes, self.entities) if c}
+        self.years = np.arange(years[0], years[1] + 1)
+
+    def top_rows(self, year, n=10):
+        """Entity rows of the `n` largest contributors in `year`, largest first."""
+        rows = self.order[year - self.years[0], :n]
+        return rows[rows >= 0]
+
+    def top(self, year, n=10):
+        """Rank, Entity, Code and Share of the `n` largest contributors in `year`."""
+        rows = self.top_rows(year, n)
+        col = year - self.years[0]
+        return pd.DataFrame({
+            "Rank": self.ranks[rows, col],
+            "Entity": self.entities[rows],
+            "Code": [self.codes[r] for r in rows],
+            "Share": self.values[rows, col],
+        })
+
+    def _long(self, entities, start, stop, array, value):
+        rows = [self.entity_index[e] for e in entities]
+        span = self.year_slice(start, stop)
+        years = self.years[span]
+        return pd.DataFrame({
+            "Entity": np.repeat(np.asarray(entities, dtype=object), len(years)),
+            "Year": np.tile(years, len(rows)),
+            value: array[rows, span].ravel(),
+        })
+
+    def rank_frame(self, entities, start=None, stop=None):
+        """Long (Entity, Year, Rank) rows; years where an entity is unranked are dropped."""
+        frame = self._long(entities, start, stop, self.ranks, "Rank")
+        return frame[frame["Rank"] > 0].reset_index(drop=True)
+
+    def share_frame(self, entities, start=None, stop=None, rest="Rest of world"):
+        """Long (Entity, Year, Share) rows, plus a `rest` series topping ranked entities up to 100%.
+
+        `rest` assumes `entities` are ranked (non-overlapping) entities; pass
+        rest=None for anything else.
+        """
+        frame = self._long(entities, start, stop, self.values, "Share")
+        if rest is None:
+            return frame
+        span = self.year_slice(start, stop)
+        rows = [self.entity_index[e] for e in entities]
+        remainder = pd.DataFrame({
+            "Entity": rest,
+            "Year": self.years[span],
+            "Share": 100 - np.nansum(self.values[rows, span], axis=0),
+        })
+        return pd.concat([frame, remainder], ignore_index=True)
+
+
+def load_contributions():
+    arrays, info = _cached("contributions_cube")
+    return ContributionCube(arrays["values"], arrays["order"], arrays["ranks"],
+                            info["entities"], info["codes"], info["years"])
+
+
+# ─── Food Production Panel ────────────────────────
+FOOD_METRICS = ["TempChange", "Growth Rate", FOOD_VALUE_COL]
+
+
+def _build_food_panel(path):
+    df = read_source("food", path)
+    df = df[df["ISO3"].notna()].sort_values(["Country", "Year"], kind="stable")
+    countries = df["Country"].drop_duplicates()
+    iso3 = df.groupby("Country", sort=False)["ISO3"].first().reindex(countries)
+    years = np.arange(df["Year"].min(), df["Year"].max() + 1)
+
+    values = np.full((len(FOOD_METRICS), len(countries), len(years)), np.nan, dtype=np.float64)
+    rows = pd.Categorical(df["Country"], categories=countries).codes
+    cols = df["Year"].to_numpy() - years[0]
+    for i, metric in enumerate(FOOD_METRICS):
+        values[i, rows, cols] = df[metric].to_numpy(dtype=np.float64)
+    return {"values": values}, {
+        "countries": countries.tolist(),
+        "iso3": iso3.tolist(),
+        "years": [int(years[0]), int(years[-1])],
+    }
+
+
+class FoodPanel(EntityLookup):
+    """TempChange, food production growth rate and food production value on one country × year grid.
+
+    The merged food export is aligned once, at cache-build time, into a
+    (metric, country, year) float64 array, so every metric pair is already
+    joined on (ISO3, Year) and per-country comparisons are row operations.
+    """
+
+    # Bump when the panel's layout changes: arrays derived from it are keyed on this
+    BUILD_VERSION = 1
+    # load_food_panel() drops the export's aggregate rows, World included
+    WORLD = None
+
+    def __init__(self, values, countries, iso3, years, shared_as=None):
+        self.values = values
+        self.countries = np.asarray(countries, dtype=object)
+        self.country_index = {c: i for i, c in enumerate(self.countries)}
+        self.iso3 = list(iso3)
+        # The panel's entities are its countries
+        self.entity_index = self.country_index
+        self.code_index = {c: country for c, country in zip(self.iso3, self.countries) if c}
+        self.years = np.arange(years[0], years[1] + 1)
+        self.shared_as = shared_as
+
+    def metric(self, name):
+        """Country × year matrix for one of FOOD_METRICS, as a view."""
+        return self.values[FOOD_METRICS.index(name)]
+
+    def pairs(self, country, metric, lag=0):
+        """(Year, TempChange, metric) rows for one country, the metric taken `lag` years later.
+
+        Years without both values are dropped; Year is the temperature year.
+        """
+        row = self.country_index[country]
+        temp = self.metric("TempChange")[row]
+        other = np.full_like(temp, np.nan)
+        n = len(temp)
+        if lag >= 0:
+            other[:n - lag] = self.metric(metric)[row, lag:]
+        else:
+            other[-lag:] = self.metric(metric)[row, :n + lag]
+        keep = ~np.isnan(temp) & ~np.isnan(other)
+        return pd.DataFrame({"Year": self.years[keep], "TempChange": temp[keep], metric: other[keep]})
+
+
+def load_food_panel():
+    """The food panel without regional/world aggregate rows (World is in the export).
+
+    Aggregates come from country_groups.csv at load time, so the handle
+    version covers both sources.
+    """
+    arrays, info = _cached("food_panel")
+    keep = ~is_aggregate(info["iso3"])
+    version = f"{source_version('food_panel')}-{source_version('country_groups')}"
+    return FoodPanel(arrays["values"][:, keep], np.asarray(info["countries"], dtype=object)[keep],
+                     np.asarray(info["iso3"], dtype=object)[keep], info["years"],
+                     shared_as=DatasetHandle("food_panel", version))
+
+
+# ─── Parallel Ingest ──────────────────────────────
+# Every cache the loaders read: name -> (cache kind, source, build, version).
+# Bump a version when its build changes.
+CACHES = {
+    "indicator": (cached_table, INDICATOR_CSV, _build_indicator, 3),
+    "country_groups": (cached_table, GROUPS_CSV, functools.partial(read_source, "country_groups"), 2),
+    "gas": (cached_table, GAS_CSV, functools.partial(read_source, "gas"), 2),
+    "contributions": (cached_table, CONTRIBUTIONS_CSV, functools.partial(read_source, "contributions"), 2),
+    "monthly": (cached_table, MONTHLY_CSV, functools.partial(read_source, "monthly"), 2),
+    "food": (cached_table, FOOD_CSV, functools.partial(read_source, "food"), 2),
+    "monthly_cube": (cached_arrays, MONTHLY_CSV, _build_monthly, 2),
+    "contributions_cube": (cached_arrays, CONTRIBUTIONS_CSV, _build_contributions, 2),
+    "food_panel": (cached_arrays, FOOD_CSV, _build_food_panel, 1),
+}
+
+# Caches that take appended year columns without a full rebuild: name -> extend
+EXTENDS = {
+    "indicator": _extend_indicator,
+}
+
+# The caches the dashboard pages read
+STARTUP_CACHES = ["indicator", "country_groups", "gas", "food", "monthly_cube", "contributions_cube", "food_panel"]
+
+
+def _cached(name):
+    kind, source, build, version = CACHES[name]
+    return kind(name, source, build, version, extend=EXTENDS.get(name))
+
+
+def _cache_fresh(name):
+    _, source, _, version = CACHES[name]
+    target = CACHE_DIR / name
+    return _is_fresh(read_meta(target), DATA_DIR / source, version, target)
+
+
+def _ingest_worker(name, data_dir, cache_dir):
+    # Runs in a pool process: use the parent's directories, build one cache
+    global DATA_DIR, CACHE_DIR, SHARED_DIR
+    DATA_DIR, CACHE_DIR, SHARED_DIR = data_dir, cache_dir, cache_dir / "shared"
+    _cached(name)
+    return name
+
+
+# Ingest workers start from a fresh interpreter; "fork" is unsafe once threads run
+INGEST_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def ingest(names=STARTUP_CACHES, workers=None):
+    """Build every stale cache in `names` at once, one per worker process.
+
+    Cold-start cost is then bounded by the largest source rather than the
+    sum of all of them. Workers write the caches; the caller's loaders
+    just memory-map them afterwards. Returns the names that were rebuilt.
+    """
+    stale = [name for name in names if not _cache_fresh(name)]
+    workers = min(workers or os.cpu_count() or 1, len(stale))
+    if workers <= 1:
+        for name in stale:
+            _cached(name)
+    else:
+        # Never fork: the dashboard's server process is multi-threaded
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(INGEST_START_METHOD)) as pool:
+            list(pool.map(_ingest_worker, stale, [DATA_DIR] * len(stale), [CACHE_DIR] * len(stale)))
+    return stale
@@ -0,0 +1,395 @@
+# 🌍 GLOBAL TEMPERATURE STATISTICS
+# Derived tables built once at load time from the climate_data loaders.
+# Everything here is read-only after construction and safe to share across
+# sessions.
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from climate_data import (FOOD_METRICS, DatasetHandle, is_aggregate, latest, load_food_raw, published_arrays,
+                          register_dataset, resolve, share, source_version, versioned)
+
+
+def _derived(cube, name, build, handle=None):
+    # Derived arrays are shared alongside the cube they come from, keyed on
+    # both builds: the cube's and their own (`build`)
+    handle = handle or cube.shared_as
+    if handle is None:
+        return None
+    return versioned(DatasetHandle(f"{handle.name}.{name}", handle.version), f"{cube.BUILD_VERSION}.{build}")
+
+
+def _base(cube, name, build, keys):
+    """(arrays, year count) of the previous release's derived `name`, when `cube` extends it.
+
+    None when the cube was built in full or those arrays are gone (or come
+    from another build); the caller then builds from scratch.
+    """
+    if getattr(cube, "extends", None) is None:
+        return None
+    handle, done = cube.extends
+    arrays = published_arrays(_derived(cube, name, build, handle))
+    if arrays is None or not all(k in arrays for k in keys):
+        return None
+    return arrays, done
+
+
+# ─── Aggregate Store ──────────────────────────────
+class AggregateStore:
+    """Per-(group, year) count, sum and sum of squares for each grouping dimension.
+
+    Means and variances for single years or for N-year buckets are derived
+    from these mergeable partial sums, so a new bucket width never rescans
+    the raw rows.
+    """
+
+    def __init__(self):
+        self._dims = {}
+
+    def add(self, dim, df, key, value="TempChange", year="Year"):
+        """Accumulate partial sums of df[value] grouped by df[key] and df[year]."""
+        df = df[df[value].notna() & df[key].notna()]
+        if df.empty:
+            return
+        groups, codes = np.unique(df[key].astype(str).to_numpy(), return_inverse=True)
+        years = df[year].to_numpy()
+        y0 = int(years.min())
+        n_years = int(years.max()) - y0 + 1
+
+        idx = codes * n_years + (years - y0)
+        size = len(groups) * n_years
+        x = df[value].to_numpy(dtype=np.float64)
+        self._dims[dim] = {
+            "value": value,
+            "groups": groups,
+            "years": np.arange(y0, y0 + n_years),
+            "n": np.bincount(idx, minlength=size).reshape(len(groups), n_years),
+            "s": np.bincount(idx, weights=x, minlength=size).reshape(len(groups), n_years),
+            "ss": np.bincount(idx, weights=x * x, minlength=size).reshape(len(groups), n_years),
+        }
+
+    def merged(self, other):
+        """A new store holding both stores' partial sums, aligned on groups and years.
+
+        Costs one pass over the (group, year) grids, however many rows the
+        sums came from; neither store is modified.
+        """
+        out = AggregateStore()
+        for dim in dict.fromkeys([*self._dims, *other._dims]):
+            parts = [store._dims[dim] for store in (self, other) if dim in store._dims]
+            groups = np.unique(np.concatenate([p["groups"] for p in parts]))
+            y0 = min(int(p["years"][0]) for p in parts)
+            years = np.arange(y0, max(int(p["years"][-1]) for p in parts) + 1)
+            merged = {"value": parts[0]["value"], "groups": groups, "years": years}
+            for k in ("n", "s", "ss"):
+                merged[k] = np.zeros((len(groups), len(years)), dtype=parts[0][k].dtype)
+                for p in parts:
+                    rows = np.searchsorted(groups, p["groups"])
+                    cols = np.arange(len(p["years"])) + int(p["years"][0]) - y0
+                    merged[k][np.ix_(rows, cols)] += p[k]
+            out._dims[dim] = merged
+        return out
+
+    def dimensions(self):
+        return list(self._dims)
+
+    def groups(self, dim):
+        return list(self._dims[dim]["groups"])
+
+    def yearly(self, dim):
+        """Mean, count and variance per (Year, group)."""
+        d = self._dims[dim]
+        return self._frame(dim, "Year", d["years"], d["n"], d["s"], d["ss"])
+
+    def bucketed(self, dim, width):
+        """Mean, count and variance per (YearGroup, group) for `width`-year buckets."""
+        d = self._dims[dim]
+        buckets = (d["years"] // width) * width
+        starts = np.r_[0, np.flatnonzero(np.diff(buckets)) + 1]
+        merge = lambda a: np.add.reduceat(a, starts, axis=1)
+        return self._frame(dim, "YearGroup", buckets[starts], merge(d["n"]), merge(d["s"]), merge(d["ss"]))
+
+    def _frame(self, dim, year_col, years, n, s, ss):
+        d = self._dims[dim]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = s / n
+            var = np.maximum(ss - s * mean, 0) / (n - 1)
+        var[n < 2] = np.nan
+
+        groups = d["groups"]
+        out = pd.DataFrame({
+            year_col: np.tile(years, len(groups)),
+            dim: np.repeat(groups, len(years)),
+            d["value"]: mean.ravel(),
+            "Count": n.ravel(),
+            "Variance": var.ravel(),
+        })
+        return out[out["Count"] > 0].sort_values([year_col, dim], ignore_index=True)
+
+
+def build_aggregates(indicator):
+    """AggregateStore over the indicator cube and the food dataset; returns its handle.
+
+    Regional/world aggregate rows (of both sources) are left out so they
+    don't skew group means.
+    When the cube only appends years to the release the current store was
+    built from, just the new years' rows are summed and merged into it.
+    """
+    cube = resolve(indicator)
+    food_version = source_version("food")
+    version = f"{indicator.version}-{food_version}"
+    previous = latest("aggregates")
+    if previous is not None and previous.version == version:
+        return previous
+
+    countries = cube.long
+    countries = countries[~countries["IsAggregate"]]
+    extends = cube.extends
+    if extends is not None and previous is not None and previous.version == f"{extends[0].version}-{food_version}":
+        delta = AggregateStore()
+        appended = countries[countries["Year"] >= cube.years[extends[1]]]
+        delta.add("DevStatus", appended, "DevStatus")
+        delta.add("Region", appended, "Region")
+        return register_dataset("aggregates", resolve(previous).merged(delta), version)
+
+    store = AggregateStore()
+    store.add("DevStatus", countries, "DevStatus")
+    store.add("Region", countries, "Region")
+    food = load_food_raw()
+    food = food[~is_aggregate(food["ISO3"])]
+    store.add("OECD_LDC", food, "OECD_LDC")
+    store.add("DevStaus", food, "DevStaus")
+    return register_dataset("aggregates", store, version)
+
+
+# ─── Variability Engine ───────────────────────────
+class VariabilityEngine:
+    """Prefix sums of x, x² and valid-value counts along the year axis of a TempCube.
+
+    The sample std of any country over any year range is then O(1)
+    arithmetic, so split years and rolling windows never rescan the data.
+    For a cube extending the previous release, the sums continue from its
+    last column over the appended years only.
+    """
+
+    # Bump when build() changes: shared results are keyed on it
+    BUILD_VERSION = 1
+
+    def __init__(self, cube):
+        def build():
+            base = _base(cube, "variability", self.BUILD_VERSION, ("n", "s1", "s2"))
+            done = 0 if base is None else base[1]
+            values = cube.values[:, done:].astype(np.float64)
+            valid = ~np.isnan(values)
+            x = np.where(valid, values, 0.0)
+            start = np.zeros((len(values), 1))
+
+            def prefix(key, a):
+                head = start if base is None else base[0][key]
+                return np.concatenate([head, head[:, -1:] + np.cumsum(a, axis=1)], axis=1)
+
+            return {"n": prefix("n", valid), "s1": prefix("s1", x), "s2": prefix("s2", x * x)}
+
+        self.cube = cube
+        sums = share(_derived(cube, "variability", self.BUILD_VERSION), build)
+        self.n, self.s1, self.s2 = sums["n"], sums["s1"], sums["s2"]
+
+    def _std(self, lo, hi):
+        # lo/hi are prefix-column indices; [lo, hi) covers years[lo:hi]
+        n = self.n[:, hi] - self.n[:, lo]
+        s1 = self.s1[:, hi] - self.s1[:, lo]
+        s2 = self.s2[:, hi] - self.s2[:, lo]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = np.maximum(s2 - s1 * s1 / n, 0) / (n - 1)
+        return np.where(n >= 2, np.sqrt(var), np.nan)
+
+    def std(self, start=None, stop=None):
+        """Per-country std over the inclusive year range [start, stop]."""
+        cols = self.cube.year_slice(start, stop)
+        return self._std(cols.start, cols.stop)
+
+    def split(self, split_year, countries_only=True):
+        """Std before `split_year` vs from `split_year` on, one row per country."""
+        early = self.std(stop=split_year - 1)
+        late = self.std(start=split_year)
+        keep = ~self.cube.aggregate if countries_only else slice(None)
+        return pd.DataFrame({
+            "Country": self.cube.countries[keep],
+            "Std_Early": early[keep],
+            "Std_Late": late[keep],
+            "Delta_Std": (late - early)[keep],
+        })
+
+    def rolling(self, countries, window):
+        """Rolling `window`-year std for the given countries, labelled by window end year."""
+        rows = [self.cube.country_index[c] for c in countries]
+        lo = np.arange(0, len(self.cube.years) - window + 1)
+        std = self._std(lo, lo + window)[rows]
+        return pd.DataFrame({
+            "Country": np.repeat(np.asarray(countries, dtype=object), len(lo)),
+            "Year": np.tile(self.cube.years[lo + window - 1], len(rows)),
+            "Rolling_Std": std.ravel(),
+        })
+
+
+# ─── Trend Metrics ────────────────────────────────
+class TrendMetrics:
+    """Year-over-year deltas, linear warming trends, coverage and ranks for every country.
+
+    Computed in one vectorized pass over a TempCube: trends are a batched
+    least-squares fit per row using masked sums, so no per-country loop.
+    The sums are kept, so a cube extending the previous release only adds
+    the appended years' terms (and re-ranks the updated trends).
+    """
+
+    # Bump when build() changes: shared results are keyed on it
+    BUILD_VERSION = 1
+
+    def __init__(self, cube):
+        def build():
+            base = _base(cube, "metrics", self.BUILD_VERSION, ("sums", "yoy"))
+            done = 0 if base is None else base[1]
+            values = cube.values[:, max(done - 1, 0):].astype(np.float64)
+            new = values[:, 1:] if done else values
+            valid = ~np.isnan(new)
+
+            yoy = np.diff(values, axis=1)
+            head = np.full((len(values), 1), np.nan) if base is None else base[0]["yoy"]
+            yoy = np.concatenate([head, yoy], axis=1)
+
+            # Years are measured from the first year, a fixed origin, so the
+            # sums of earlier releases stay valid as years are appended
+            x = np.where(valid, (cube.years[done:] - cube.years[0]).astype(np.float64), 0.0)
+            y = np.where(valid, new, 0.0)
+            sums = np.stack([valid.sum(axis=1), x.sum(axis=1), y.sum(axis=1),
+                             (x * x).sum(axis=1), (x * y).sum(axis=1)], axis=1).astype(np.float64)
+            if base is not None:
+                sums += base[0]["sums"]
+
+            n, sx, sy, sxx, sxy = sums.T
+            with np.errstate(invalid="ignore", divide="ignore"):
+                denom = n * sxx - sx * sx
+                slope = np.where((n >= 2) & (denom > 0), (n * sxy - sx * sy) / denom, np.nan)
+                intercept = (sy - slope * sx) / n - slope * cube.years[0]
+
+            ranked = pd.Series(np.where(~cube.aggregate, slope, np.nan))
+            trend_rank = ranked.rank(ascending=False, method="min").to_numpy()
+            return {"yoy": yoy, "coverage": n.astype(np.int64), "slope": slope, "intercept": intercept,
+                    "trend_rank": trend_rank, "sums": sums}
+
+        self.cube = cube
+        metrics = share(_derived(cube, "metrics", self.BUILD_VERSION), build)
+        self.yoy = metrics["yoy"]
+        self.coverage = metrics["coverage"]
+        self.slope = metrics["slope"]
+        self.intercept = metrics["intercept"]
+        self.trend_rank = metrics["trend_rank"]
+
+    def table(self, countries_only=True):
+        """One row per country: trend (°C/decade), intercept, coverage and trend rank."""
+        keep = ~self.cube.aggregate if countries_only else slice(None)
+        return pd.DataFrame({
+            "Country": self.cube.countries[keep],
+            "Trend": self.slope[keep] * 10,
+            "Intercept": self.intercept[keep],
+            "Coverage": self.coverage[keep],
+            "Trend_Rank": self.trend_rank[keep],
+        })
+
+    def fastest_warming(self, n=10, min_years=30):
+        """Steepest warming trends among countries with at least `min_years` values."""
+        table = self.table()
+        return table[table["Coverage"] >= min_years].nlargest(n, "Trend")
+
+    def sample_countries(self, n=10, min_years=20):
+        """Best-covered real countries with at least `min_years` values, best first."""
+        table = self.table()
+        table = table[table["Coverage"] >= min_years]
+        table = table.sort_values(["Coverage", "Country"], ascending=[False, True], kind="stable")
+        return table["Country"].head(n).tolist()
+
+    def yoy_frame(self, countries):
+        """Long rows for the countries with a YoY_Change column from the precomputed deltas."""
+        frame = self.cube.frame(countries)
+        rows = frame[self.cube.key].astype(str).map(self.cube.country_index).to_numpy()
+        cols = frame["Year"].to_numpy() - self.cube.years[0]
+        # The source carries three decimals; rounding drops float32 noise
+        return frame.assign(YoY_Change=np.round(self.yoy[rows, cols], 3))
+
+
+# ─── Food Correlations ────────────────────────────
+def lagged_correlation(x, y, lag=0):
+    """Row-wise Pearson r between x[:, t] and y[:, t + lag], plus the overlapping-year counts.
+
+    Each row only uses years where both values exist. Means are taken per
+    row before the products, so large-magnitude series (production values)
+    don't lose precision. Rows with fewer than three pairs get NaN.
+    """
+    width = x.shape[1]
+    if lag >= 0:
+        x, y = x[:, :width - lag], y[:, lag:]
+    else:
+        x, y = x[:, -lag:], y[:, :width + lag]
+    valid = ~np.isnan(x) & ~np.isnan(y)
+    n = valid.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dx = np.where(valid, x - (np.where(valid, x, 0).sum(axis=1) / n)[:, None], 0.0)
+        dy = np.where(valid, y - (np.where(valid, y, 0).sum(axis=1) / n)[:, None], 0.0)
+        r = (dx * dy).sum(axis=1) / np.sqrt((dx * dx).sum(axis=1) * (dy * dy).sum(axis=1))
+    return np.where(n >= 3, np.clip(r, -1, 1), np.nan), n
+
+
+class FoodCorrelations:
+    """Per-country correlation of TempChange with each food metric, for every lag in LAGS.
+
+    Built once over a FoodPanel: each (metric, lag) is a single masked pass
+    over all countries, and the page only indexes the stored results. A
+    positive lag pairs a year's temperature with the food figure `lag` years
+    later.
+    """
+
+    LAGS = np.arange(-5, 6)
+
+    # Bump when build() changes: shared results are keyed on it
+    BUILD_VERSION = 1
+
+    def __init__(self, panel, lags=LAGS):
+        self.lags = np.asarray(lags)
+        self.metrics = [m for m in FOOD_METRICS if m != "TempChange"]
+
+        def build():
+            temp = panel.metric("TempChange")
+            shape = (len(self.metrics), len(self.lags), len(panel.countries))
+            r, n = np.empty(shape), np.empty(shape, dtype=np.int32)
+            for i, metric in enumerate(self.metrics):
+                for j, lag in enumerate(self.lags):
+                    r[i, j], n[i, j] = lagged_correlation(temp, panel.metric(metric), int(lag))
+            return {"r": r, "n": n}
+
+        self.panel = panel
+        # Each set of lags is its own dataset, so callers using different lags do not evict each other
+        lags_key = hashlib.sha256(self.lags.astype(np.int64).tobytes()).hexdigest()[:8]
+        results = share(_derived(panel, f"correlations-{lags_key}", self.BUILD_VERSION), build)
+        self.r, self.n = results["r"], results["n"]
+
+    def _at(self, metric, lag):
+        return self.metrics.index(metric), int(np.searchsorted(self.lags, lag))
+
+    def table(self, metric, lag=0, min_years=10):
+        """Country, ISO3, r and overlapping years for one metric and lag, strongest |r| first."""
+        i, j = self._at(metric, lag)
+        out = pd.DataFrame({
+            "Country": self.panel.countries,
+            "ISO3": self.panel.iso3,
+            "r": self.r[i, j],
+            "Years": self.n[i, j],
+        })
+        out = out[(out["Years"] >= min_years) & out["r"].notna()]
+        return out.iloc[np.argsort(-out["r"].abs().to_numpy(), kind="stable")].reset_index(drop=True)
+
+    def lag_profile(self, country, metric):
+        """Lag, r and overlapping years for one country across all lags."""
+        i = self.metrics.index(metric)
+        row = self.panel.country_index[country]
+        return pd.DataFrame({"Lag": self.lags, "r": self.r[i, :, row], "Years": self.n[i, :, row]})
@@ -0,0 +1,172 @@
+# 🌍 STATIC SNAPSHOTS
+# Pre-rendered Vega-Lite specs (data inlined) for the dashboard's default
+# views. The build command drives the dashboard headlessly for every chart
+# page and a set of popular countries, recording each chart as it is shown;
+# the dashboard then serves a recorded spec instead of rebuilding the chart
+# whenever the view's filters match one that was recorded.
+#
+#   python snapshots.py --countries "United States" China India
+#
+# Snapshots live in .data_cache/snapshots/<version>/, where the version hashes
+# every source file and the chart code, so edited data or charts never serve
+# a stale snapshot; the dashboard falls back to building live instead.
+import argparse
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import climate_data
+
+DASHBOARD = Path(__file__).resolve().parent / "Project Dashboard.py"
+RECORD_ENV = "DASHBOARD_SNAPSHOT_RECORD"
+
+# The code that turns the startup caches into specs
+CODE_FILES = [DASHBOARD.name, "climate_charts.py", "chart_data.py", "climate_stats.py", "climate_data.py"]
+
+POPULAR_COUNTRIES = ["United States", "China, P.R.: Mainland", "India", "Germany", "Brazil", "United Kingdom"]
+
+# (page, Explore Trends tab) pairs that show charts
+SNAPSHOT_VIEWS = [
+    ("Explore Trends", "📈 Year-over-Year"),
+    ("Explore Trends", "🌡️ Scatter Plot"),
+    ("Explore Trends", "🔻 Variability"),
+    ("Explore Trends", "🌍 Country Status"),
+    ("Warming Gases", None),
+    ("Monthly Explorer", None),
+    ("Contributions", None),
+    ("Food & Climate", None),
+]
+
+
+def snapshot_root():
+    return climate_data.CACHE_DIR / "snapshots"
+
+
+def snapshot_version():
+    """Hash of every startup source and the chart code; '' until the sources are ingested."""
+    parts = [climate_data.source_version(name) for name in climate_data.STARTUP_CACHES]
+    if not all(parts):
+        return ""
+    parts += [climate_data.file_hash(DASHBOARD.parent / name)[:12] for name in CODE_FILES]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:12]
+
+
+def snapshot_key(label, params):
+    raw = json.dumps([label, params], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+# ─── Serving ──────────────────────────────────────
+class SnapshotStore:
+    """Recorded charts for one snapshot version; empty if none was built."""
+
+    def __init__(self, version):
+        self.version = version
+        self.dir = climate_data.current_version(snapshot_root() / version)
+        manifest = climate_data.read_meta(self.dir) if version else None
+        self.charts = manifest["charts"] if manifest else {}
+
+    def __len__(self):
+        return len(self.charts)
+
+    def get(self, label, params):
+        """Vega-Lite spec dict recorded for this chart and filters, or None.
+
+        Parsed on every call: Streamlit moves inlined datasets out of the
+        spec it is given, so a shared dict would not survive a second render.
+        """
+        key = snapshot_key(label, params)
+        if key not in self.charts:
+            return None
+        with open(self.dir / f"{key}.json", encoding="utf-8") as fh:
+            return json.load(fh)
+
+
+# ─── Recording ────────────────────────────────────
+def recording_dir():
+    """Staging directory of a running build, or None when serving normally."""
+    path = os.environ.get(RECORD_ENV)
+    return Path(path) if path else None
+
+
+def record(label, params, chart):
+    key = snapshot_key(label, params)
+    target = recording_dir()
+    with open(target / f"{key}.json", "w", encoding="utf-8") as fh:
+        fh.write(chart.to_json(indent=None))
+    with open(target / f"{key}.label.json", "w", encoding="utf-8") as fh:
+        json.dump({"label": label, "params": params}, fh, default=str)
+
+
+def _render(view, country):
+    from streamlit.testing.v1 import AppTest
+
+    page, tab = view
+    app = AppTest.from_file(str(DASHBOARD), default_timeout=300)
+    if tab is not None:
+        app.session_state["explore_tab"] = tab
+    app.run()
+    app.sidebar.radio[0].set_value(page).run()
+    if country != "All":
+        app.sidebar.selectbox[0].set_value(country).run()
+    if app.exception:
+        raise RuntimeError(f"{page} / {tab or '-'} / {country}: {app.exception[0].message}")
+
+
+def build(countries, keep=2):
+    """Record every chart page for "All" and `countries`; returns the snapshot directory."""
+    climate_data.ingest()
+    version = snapshot_version()
+    if not version:
+        raise RuntimeError("sources are not ingested; cannot version a snapshot")
+    known = set(climate_data.resolve(climate_data.load_indicator_cube()).countries)
+    unknown = [country for country in countries if country not in known]
+    if unknown:
+        raise ValueError(f"not in the indicator data: {', '.join(unknown)}")
+    target = snapshot_root() / version
+    staging = climate_data.staging_dir(target)
+    os.environ[RECORD_ENV] = str(staging)
+    try:
+        for country in ["All"] + list(countries):
+            for view in SNAPSHOT_VIEWS:
+                _render(view, country)
+    finally:
+        del os.environ[RECORD_ENV]
+
+    charts = {}
+    for path in staging.glob("*.label.json"):
+        with open(path, encoding="utf-8") as fh:
+            charts[path.name.split(".")[0]] = json.load(fh)
+        path.unlink()
+    climate_data.write_meta(staging, {
+        "version": version, "built": time.time(), "countries": ["All"] + list(countries), "charts": charts,
+    })
+    climate_data.publish(staging, target)
+
+    # Older versions can never be served again; keep a few for rollbacks
+    old = sorted((p for p in snapshot_root().iterdir() if p != target and climate_data.is_published(p)),
+                 key=lambda p: p.stat().st_mtime)
+    for path in old[:max(len(old) - (keep - 1), 0)]:
+        climate_data.unpublish(path)
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render the dashboard's default views.")
+    parser.add_argument("--countries", nargs="*", default=POPULAR_COUNTRIES,
+                        help="sidebar countries to pre-render besides \"All\"")
+    parser.add_argument("--keep", type=int, default=2, help="snapshot versions to keep, this one included")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    target = build(args.countries, args.keep)
+    manifest = climate_data.read_meta(target)
+    size = sum(p.stat().st_size for p in target.iterdir()) / 2**20
+    print(f"{len(manifest['charts'])} charts, {size:.1f} MB in {target} "
+          f"({time.perf_counter() - started:.0f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# 🌍 STAGE TIMING
+# Wall-clock (and optionally peak-allocation) timings for named stages of a
+# dashboard rerun. Used by the opt-in timing panel and by benchmark.py.
+import os
+import time
+import tracemalloc
+from collections import namedtuple
+from contextlib import contextmanager
+
+import pandas as pd
+
+# Set DASHBOARD_TIMINGS=1 to show the per-stage timing and chart payload panels in the sidebar
+TIMINGS_ENABLED = os.environ.get("DASHBOARD_TIMINGS", "") not in ("", "0")
+
+StageTiming = namedtuple("StageTiming", ["stage", "ms", "peak_mb"])
+
+
+class StageTimer:
+    """Records one StageTiming per `with timer.stage(name):` block.
+
+    Stages may nest; an outer stage's time includes its inner stages. With
+    `memory=True` each stage also records the tracemalloc peak reached while
+    it ran (numpy buffers included), at the cost of slower allocations; keep
+    stages flat then, since an inner stage resets the peak. Call stop() when
+    done, so tracing the timer started does not slow everything after it.
+    """
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.tracing = False
+        self.stages = []
+        self.started = time.perf_counter()
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    @contextmanager
+    def stage(self, name):
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.tracing = True
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            peak = tracemalloc.get_traced_memory()[1] / 2**20 if self.memory else float("nan")
+            self.stages.append(StageTiming(name, ms, peak))
+
+    def stop(self):
+        """Stop tracemalloc if this timer started it."""
+        if self.tracing:
+            tracemalloc.stop()
+            self.tracing = False
+
+    def frame(self):
+        return pd.DataFrame(self.stages, columns=StageTiming._fields)